@@ -118,6 +118,16 @@ except ImportError:
         }
     }
 
+# Read-only alias for analysis commands (get_odds). Points to a follower via
+# REPLICA_DATABASE_URL, or to the same database as 'default' if not set
+_replica_url = os.getenv('REPLICA_DATABASE_URL')
+if _replica_url:
+    import dj_database_url
+    DATABASES['replica'] = dj_database_url.parse(_replica_url, conn_max_age=600, conn_health_checks=True)
+else:
+    DATABASES['replica'] = dict(DATABASES['default'])
+DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -0,0 +1,195 @@
+"""
+Cache en disco con TTL para respuestas HTTP (The Odds API, Football-Data.org)
+
+Cada respuesta se guarda en .cache/http/<sha1>.bin: una línea JSON con los
+metadatos (expiración, status, headers) seguida del body original sin parsear.
+- Entradas frescas: se devuelven sin tocar la red
+- Entradas caducadas: se revalidan con If-None-Match/If-Modified-Since
+  (un 304 renueva el TTL sin descargar el body) y se usan como fallback si
+  la API responde 429/5xx o falla la conexión (stale-if-error)
+
+También guarda el estado de cuota/rate limit de cada API entre ejecuciones
+(save_quota/read_quota y RequestLog).
+
+Uso:
+    async with aiohttp.ClientSession() as session:
+        response = await cached_get(session, url, params, ttl=60)
+        data = orjson.loads(response.body)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiohttp
+import orjson
+from django.conf import settings
+
+
+# TTLs por tipo de endpoint (segundos)
+TTL_SHORT = 60            # Cuotas: cambian constantemente
+TTL_LONG = 6 * 60 * 60    # Fixtures: casi estáticos
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: dict
+    body: bytes
+    expires_at: float = 0
+    from_cache: bool = False
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+def _state_dir():
+    return Path(settings.BASE_DIR) / '.cache'
+
+
+class TTLCache:
+    """File cache keyed by sha1(url + params)"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or _state_dir() / 'http')
+
+    def _path(self, url, params=None):
+        key = url + json.dumps(params or {}, sort_keys=True, default=str)
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.bin"
+
+    def get(self, url, params=None):
+        """Return the cached entry (fresh or expired) or None"""
+        try:
+            with open(self._path(url, params), 'rb') as f:
+                meta_line, body = f.read().split(b'\n', 1)
+            entry = orjson.loads(meta_line)
+        except (OSError, ValueError):
+            return None
+
+        return CachedResponse(
+            status=entry['status'],
+            headers=entry['headers'],
+            body=body,
+            expires_at=entry['expires_at'],
+            from_cache=True,
+        )
+
+    def set(self, url, params, ttl, status, headers, body):
+        """Store a response for `ttl` seconds"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'expires_at': time.time() + ttl,
+            'status': status,
+            'headers': headers,
+        }
+        path = self._path(url, params)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(entry) + b'\n' + body)
+        tmp_path.replace(path)
+
+
+async def cached_get(session, url, params=None, ttl=TTL_SHORT, cache=None, refresh=False):
+    """
+    GET con cache TTL en disco
+
+    Args:
+        session: aiohttp.ClientSession
+        ttl: segundos que la respuesta se considera fresca
+        refresh: ignorar entradas frescas (las caducadas siguen sirviendo de fallback)
+
+    Returns:
+        CachedResponse (from_cache=True si no se usó la red)
+    """
+    cache = cache or TTLCache()
+    cached = cache.get(url, params)
+
+    if cached and not refresh and not cached.expired:
+        return cached
+
+    # Revalidación condicional con los validadores de la copia guardada
+    conditional = {}
+    if cached:
+        if cached.headers.get('etag'):
+            conditional['If-None-Match'] = cached.headers['etag']
+        if cached.headers.get('last-modified'):
+            conditional['If-Modified-Since'] = cached.headers['last-modified']
+
+    try:
+        async with session.get(url, params=params, headers=conditional) as response:
+            status = response.status
+            headers = {k.lower(): v for k, v in response.headers.items()}
+            body = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        # Error de red o ClientTimeout agotado: servir la copia caducada
+        if cached:
+            return cached
+        raise
+
+    if status == 304 and cached:
+        # Sin cambios: reutilizar el body guardado y renovar su TTL
+        headers = {**cached.headers, **headers}
+        cache.set(url, params, ttl, 200, headers, cached.body)
+        return CachedResponse(status=200, headers=headers, body=cached.body)
+
+    if status == 200:
+        cache.set(url, params, ttl, status, headers, body)
+    elif cached and (status == 429 or status >= 500):
+        # Upstream con rate limit o caído: servir la copia caducada
+        return cached
+
+    return CachedResponse(status=status, headers=headers, body=body)
+
+
+def read_quota(name):
+    """Last known remaining request quota for an API, or None if unknown"""
+    try:
+        return int((_state_dir() / f'{name}.quota').read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def save_quota(name, remaining):
+    """Persist the remaining request quota reported by an API"""
+    path = _state_dir() / f'{name}.quota'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(str(remaining))
+
+
+class RequestLog:
+    """
+    Ventana deslizante de llamadas reales a una API, persistida entre ejecuciones
+
+    Evita superar el rate limit (p.ej. 10 requests/minuto) cuando el comando
+    se lanza varias veces seguidas.
+    """
+
+    def __init__(self, name, max_requests, period=60):
+        self.path = _state_dir() / f'{name}.requests'
+        self.max_requests = max_requests
+        self.period = period
+        try:
+            stamps = [float(x) for x in self.path.read_text().split()]
+        except (OSError, ValueError):
+            stamps = []
+        self.stamps = deque(stamps, maxlen=max_requests)
+
+    def wait_time(self):
+        """Seconds to wait before the next request fits in the window"""
+        cutoff = time.time() - self.period
+        while self.stamps and self.stamps[0] <= cutoff:
+            self.stamps.popleft()
+        if len(self.stamps) < self.max_requests:
+            return 0
+        return self.stamps[0] - cutoff
+
+    def record(self):
+        """Register a request made now"""
+        self.stamps.append(time.time())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(' '.join(f'{t:.3f}' for t in self.stamps))
@@ -9,6 +9,16 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from predictions.models import Team, Match, Player, TeamStats, TeamMarketValue
 from thefuzz import fuzz
+import numpy as np
+
+
+# Scorers ordered cheapest-first: the first one that clears the threshold
+# decides the match, so the costlier ones only run for near misses
+NAME_SCORERS = (
+    ('simple', fuzz.ratio),
+    ('partial', fuzz.partial_ratio),
+    ('token', fuzz.token_set_ratio),
+)
 
 
 class Command(BaseCommand):
@@ -70,37 +80,47 @@ class Command(BaseCommand):
 
         consolidated = 0
         processed = set()
+        # Candidates still unmerged (positions in all_teams); rebuilt after
+        # each merge instead of checking `processed` for every pair
+        remaining = list(range(len(all_teams)))
 
-        for team in all_teams:
+        names = [t.name.lower() for t in all_teams]
+        lens = np.array([len(n) for n in names])
+
+        for idx, team in enumerate(all_teams):
             if team.id in processed:
                 continue
 
+            # Upper bound of fuzz.ratio given only the name lengths
+            # (2*min/(la+lb)); pairs below it can skip the 'simple' scorer.
+            # Not valid for partial/token scorers, so those still run.
+            ratio_upper = 200 * np.minimum(lens[idx], lens) / np.maximum(lens[idx] + lens, 1)
+            ratio_possible = (ratio_upper + 0.5) >= threshold
+
             # Find similar teams
             similar_teams = []
-            for other_team in all_teams:
-                if other_team.id == team.id or other_team.id in processed:
+            for other_idx in remaining:
+                if other_idx == idx:
                     continue
+                other_team = all_teams[other_idx]
 
                 # Skip if different competition (unless --competition or --cross-competition was specified)
                 if not comp_filter and not cross_comp:
                     if team.competition_id != other_team.competition_id:
                         continue
 
-                # Check by name similarity using multiple methods
-                ratio_simple = fuzz.ratio(team.name.lower(), other_team.name.lower())
-                ratio_partial = fuzz.partial_ratio(team.name.lower(), other_team.name.lower())
-                ratio_token = fuzz.token_set_ratio(team.name.lower(), other_team.name.lower())
-
-                # Use the highest ratio
-                max_ratio = max(ratio_simple, ratio_partial, ratio_token)
-
-                if max_ratio >= threshold:
-                    similar_teams.append({
-                        'team': other_team,
-                        'ratio': max_ratio,
-                        'method': 'simple' if max_ratio == ratio_simple else
-                                  'partial' if max_ratio == ratio_partial else 'token'
-                    })
+                # Check by name similarity, stopping at the first method that matches
+                for method, scorer in NAME_SCORERS:
+                    if method == 'simple' and not ratio_possible[other_idx]:
+                        continue
+                    ratio = scorer(names[idx], names[other_idx])
+                    if ratio >= threshold:
+                        similar_teams.append({
+                            'team': other_team,
+                            'ratio': ratio,
+                            'method': method
+                        })
+                        break
 
             if similar_teams:
                 self.stdout.write(f"\n[DUPLICADO ENCONTRADO] {team.name} (ID: {team.id}, api_id: {team.api_id})")
@@ -137,6 +157,7 @@ class Command(BaseCommand):
                     processed.add(keeper.id)
                     for t in teams_to_merge:
                         processed.add(t.id)
+                    remaining = [i for i in remaining if all_teams[i].id not in processed]
 
                     consolidated += 1
                     self.stdout.write(self.style.SUCCESS(f"  [OK] Consolidado en {keeper.name} (ID: {keeper.id})"))
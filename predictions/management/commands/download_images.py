@@ -17,13 +17,28 @@ Usage:
 
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db import transaction
 from predictions.models import Team, Player
-from predictions.sofascore_api import SofascoreAPI
+from predictions.scrapers.utils import get_browser_headers
 from asgiref.sync import sync_to_async
 
 import asyncio
+import os
 from pathlib import Path
 import aiofiles
+import httpx
+
+
+# Images are plain binary responses: fetch them over a pooled HTTP/2 client
+# instead of navigating a Playwright page for each one
+IMAGE_HEADERS = {
+    'User-Agent': get_browser_headers()['User-Agent'],
+    'Referer': 'https://www.sofascore.com/',
+}
+IMAGE_CLIENT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+
+# Downloaded paths are written to the DB in batches of this size
+UPDATE_BATCH_SIZE = 100
 
 
 class Command(BaseCommand):
@@ -106,7 +121,12 @@ class Command(BaseCommand):
     async def download_images_async(self, download_teams, download_players,
                                     force, dry_run, limit):
         """Main async download function"""
-        api = SofascoreAPI(delay_min=1, delay_max=2)  # Shorter delays for images
+        client = httpx.AsyncClient(
+            http2=True,
+            limits=IMAGE_CLIENT_LIMITS,
+            headers=IMAGE_HEADERS,
+            timeout=30,
+        )
 
         try:
             # Create media directories
@@ -129,7 +149,7 @@ class Command(BaseCommand):
                 self.stdout.write("=" * 80)
 
                 team_stats = await self.download_team_logos(
-                    api, force, dry_run, limit
+                    client, force, dry_run, limit
                 )
                 stats['teams_downloaded'] = team_stats['downloaded']
                 stats['teams_skipped'] = team_stats['skipped']
@@ -142,14 +162,14 @@ class Command(BaseCommand):
                 self.stdout.write("=" * 80)
 
                 player_stats = await self.download_player_photos(
-                    api, force, dry_run, limit
+                    client, force, dry_run, limit
                 )
                 stats['players_downloaded'] = player_stats['downloaded']
                 stats['players_skipped'] = player_stats['skipped']
                 stats['players_failed'] = player_stats['failed']
 
         finally:
-            await api.close()
+            await client.aclose()
 
         # Summary
         self.stdout.write("\n" + "=" * 80)
@@ -176,7 +196,7 @@ class Command(BaseCommand):
         teams_dir.mkdir(parents=True, exist_ok=True)
         players_dir.mkdir(parents=True, exist_ok=True)
 
-    async def download_team_logos(self, api, force, dry_run, limit):
+    async def download_team_logos(self, client, force, dry_run, limit):
         """Download all team logos"""
         stats = {'downloaded': 0, 'skipped': 0, 'failed': 0}
 
@@ -192,6 +212,9 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Total equipos a procesar: {total}")
 
+        pending = []
+        teams_dir = os.path.join(settings.MEDIA_ROOT, 'teams')
+
         for idx, team in enumerate(teams, 1):
             try:
                 team_id = team.api_id
@@ -199,10 +222,14 @@ class Command(BaseCommand):
 
                 # Check if already downloaded
                 relative_path = f'teams/{team_id}.png'
-                full_path = Path(settings.MEDIA_ROOT) / relative_path
+                full_path = f'{teams_dir}/{team_id}.png'
 
-                if not force and full_path.exists():
+                if not force and os.path.exists(full_path):
                     stats['skipped'] += 1
+                    # File downloaded by a run whose DB update never happened
+                    if not dry_run and team.crest_url != relative_path:
+                        team.crest_url = relative_path
+                        pending.append(team)
                     if idx % 10 == 0 or idx == 1 or idx == total:
                         self.stdout.write(
                             f"  [{idx}/{total}] {team_name} - OMITIDO (ya existe)"
@@ -218,11 +245,12 @@ class Command(BaseCommand):
 
                 # Download image
                 image_url = f"https://api.sofascore.com/api/v1/team/{team_id}/image"
-                success = await self.download_image(api, image_url, full_path)
+                success = await self.download_image(client, image_url, full_path)
 
                 if success:
-                    # Update database
-                    await self._update_team_crest(team, relative_path)
+                    # Queue database update
+                    team.crest_url = relative_path
+                    pending.append(team)
                     stats['downloaded'] += 1
 
                     if idx % 10 == 0 or idx == 1 or idx == total:
@@ -247,9 +275,16 @@ class Command(BaseCommand):
                     )
                 )
 
+            if len(pending) >= UPDATE_BATCH_SIZE:
+                await self._flush_image_paths(Team, pending, 'crest_url')
+                pending = []
+
+        if pending:
+            await self._flush_image_paths(Team, pending, 'crest_url')
+
         return stats
 
-    async def download_player_photos(self, api, force, dry_run, limit):
+    async def download_player_photos(self, client, force, dry_run, limit):
         """Download all player photos"""
         stats = {'downloaded': 0, 'skipped': 0, 'failed': 0}
 
@@ -265,6 +300,9 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Total jugadores a procesar: {total}")
 
+        pending = []
+        players_dir = os.path.join(settings.MEDIA_ROOT, 'players')
+
         for idx, player in enumerate(players, 1):
             try:
                 player_id = player.sofascore_id
@@ -272,10 +310,14 @@ class Command(BaseCommand):
 
                 # Check if already downloaded
                 relative_path = f'players/{player_id}.png'
-                full_path = Path(settings.MEDIA_ROOT) / relative_path
+                full_path = f'{players_dir}/{player_id}.png'
 
-                if not force and full_path.exists():
+                if not force and os.path.exists(full_path):
                     stats['skipped'] += 1
+                    # File downloaded by a run whose DB update never happened
+                    if not dry_run and player.photo != relative_path:
+                        player.photo = relative_path
+                        pending.append(player)
                     if idx % 50 == 0 or idx == 1 or idx == total:
                         self.stdout.write(
                             f"  [{idx}/{total}] {player_name} - OMITIDO (ya existe)"
@@ -292,11 +334,12 @@ class Command(BaseCommand):
 
                 # Download image
                 image_url = f"https://api.sofascore.com/api/v1/player/{player_id}/image"
-                success = await self.download_image(api, image_url, full_path)
+                success = await self.download_image(client, image_url, full_path)
 
                 if success:
-                    # Update database
-                    await self._update_player_photo(player, relative_path)
+                    # Queue database update
+                    player.photo = relative_path
+                    pending.append(player)
                     stats['downloaded'] += 1
 
                     if idx % 50 == 0 or idx == 1 or idx == total:
@@ -322,26 +365,27 @@ class Command(BaseCommand):
                     )
                 )
 
+            if len(pending) >= UPDATE_BATCH_SIZE:
+                await self._flush_image_paths(Player, pending, 'photo')
+                pending = []
+
+        if pending:
+            await self._flush_image_paths(Player, pending, 'photo')
+
         return stats
 
-    async def download_image(self, api, url, output_path):
+    async def download_image(self, client, url, output_path):
         """
         Download a single image from SofaScore
         Returns True if successful, False otherwise
         """
         try:
-            await api._init_browser()
-            await api._wait_if_needed()
-
-            response = await api.page.goto(url)
-
-            if response.status == 200:
-                # Get image bytes
-                image_bytes = await response.body()
+            response = await client.get(url)
 
+            if response.status_code == 200:
                 # Save to file
                 async with aiofiles.open(output_path, 'wb') as f:
-                    await f.write(image_bytes)
+                    await f.write(response.content)
 
                 return True
             else:
@@ -350,12 +394,18 @@ class Command(BaseCommand):
         except Exception:
             return False
 
-    async def _update_team_crest(self, team, relative_path):
-        """Update team crest_url field"""
-        team.crest_url = relative_path
-        await sync_to_async(team.save)(update_fields=['crest_url'])
+    async def _flush_image_paths(self, model, objs, field):
+        """Save a batch of image paths, reporting a DB error instead of aborting"""
+        try:
+            await sync_to_async(self._save_image_paths)(model, objs, field)
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"  ERROR guardando {len(objs)} rutas de {model.__name__}: {e}"
+                )
+            )
 
-    async def _update_player_photo(self, player, relative_path):
-        """Update player photo field"""
-        player.photo = relative_path
-        await sync_to_async(player.save)(update_fields=['photo'])
+    def _save_image_paths(self, model, objs, field):
+        """Save the image path field of a batch of objects in one transaction"""
+        with transaction.atomic():
+            model.objects.bulk_update(objs, [field], batch_size=1000)
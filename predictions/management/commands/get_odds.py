@@ -4,10 +4,16 @@ Uso: python manage.py get_odds --days 7 --competitions PL,PD
 """
 
 from django.core.management.base import BaseCommand
-from predictions.models import Match, Competition, Prediction
+from predictions.models import Competition, Prediction
+from predictions.http_cache import cached_get, read_quota, save_quota, TTL_SHORT
+from predictions.management.commands.import_fixtures import TEAM_NAME_MAPPING
+from predictions.scrapers.utils import TEAM_NAME_OVERRIDES
 from django.utils import timezone
 from datetime import timedelta
-import requests
+import aiohttp
+import asyncio
+import numpy as np
+import orjson
 import os
 import sys
 from pathlib import Path
@@ -52,20 +58,14 @@ def calculate_edge(model_prob: float, implied_prob: float) -> float:
     return model_prob - implied_prob
 
 
+# Grade boundaries: an edge strictly above _GRADE_THRESHOLDS[i] earns _GRADES[i + 1]
+_GRADE_THRESHOLDS = np.array([0.02, 0.03, 0.05, 0.07, 0.10])
+_GRADES = np.array(["F", "D", "C", "B", "A", "A+"])
+
+
 def grade_bet(edge: float) -> str:
     """Grade bet quality by edge size."""
-    if edge > 0.10:
-        return "A+"
-    elif edge > 0.07:
-        return "A"
-    elif edge > 0.05:
-        return "B"
-    elif edge > 0.03:
-        return "C"
-    elif edge > 0.02:
-        return "D"
-    else:
-        return "F"
+    return str(_GRADES[np.searchsorted(_GRADE_THRESHOLDS, edge, side='left')])
 
 
 def kelly_stake(probability: float, odds: float, bankroll: float,
@@ -148,6 +148,91 @@ def analyze_match(home_prob: float, draw_prob: float, away_prob: float,
     }
 
 
+MARKETS = (("Home Win", "home"), ("Draw", "draw"), ("Away Win", "away"))
+
+
+def analyze_matches(probs, odds, bankroll: float = 1000, kelly_fraction: float = 0.25,
+                    min_edge: float = 0.03, max_stake_pct: float = 0.05) -> dict:
+    """
+    Vectorized analyze_bet over many matches at once.
+
+    probs and odds are (N, 3) arrays (home, draw, away). Returns a dict of
+    (N, 3) arrays with the same fields as ValueBet, computed exactly as
+    analyze_bet/kelly_stake/calculate_ev do for a single bet.
+    """
+    probs = np.asarray(probs, dtype=float)
+    odds = np.asarray(odds, dtype=float)
+
+    implied = 1.0 / odds
+    edge = probs - implied
+    grade = _GRADES[np.searchsorted(_GRADE_THRESHOLDS, edge, side='left')]
+
+    # Kelly: only positive expected edge gets a stake
+    kelly_edge = probs * odds - 1.0
+    positive = kelly_edge > 0
+    kelly = np.where(positive, kelly_edge / np.where(positive, odds - 1.0, 1.0), 0.0)
+    stake = np.minimum(bankroll * kelly * kelly_fraction, bankroll * max_stake_pct)
+
+    staked = stake > 0
+    ev = np.where(staked, probs * stake * (odds - 1.0) - (1.0 - probs) * stake, 0.0)
+    roi = np.where(staked, ev / np.where(staked, stake, 1.0) * 100, 0.0)
+
+    return {
+        "model_prob": probs,
+        "odds": odds,
+        "implied_prob": implied,
+        "edge": edge,
+        "grade": grade,
+        "kelly_fraction": kelly,
+        "stake": stake,
+        "ev": ev,
+        "roi": roi,
+        "is_value": edge >= min_edge,
+    }
+
+
+# ============================================================================
+# RESOLUCIÓN DE NOMBRES DE EQUIPOS
+# ============================================================================
+
+# Nombre externo (API) -> nombre en BD, en minúsculas, para búsquedas exactas en dict
+TEAM_ALIASES = {
+    alias.lower(): canonical.lower()
+    for mapping in (TEAM_NAME_MAPPING, TEAM_NAME_OVERRIDES)
+    for alias, canonical in mapping.items()
+}
+
+
+# ============================================================================
+# DESCARGA DE CUOTAS (The Odds API)
+# ============================================================================
+
+ODDS_API_BASE_URL = "https://api.the-odds-api.com/v4/sports"
+
+
+async def fetch_odds(session, sport_key, params):
+    """
+    Download odds for one sport key.
+    Returns (events, requests remaining); remaining is None for cached responses.
+    """
+    url = f"{ODDS_API_BASE_URL}/{sport_key}/odds"
+    response = await cached_get(session, url, params, ttl=TTL_SHORT)
+    if response.status != 200:
+        raise RuntimeError(f"HTTP {response.status}: {response.body[:200].decode('utf-8', 'replace')}")
+    remaining = None if response.from_cache else response.headers.get('x-requests-remaining')
+    return orjson.loads(response.body), remaining
+
+
+async def fetch_all_odds(sport_keys, params):
+    """Download odds for all sport keys concurrently (exceptions are returned, not raised)."""
+    timeout = aiohttp.ClientTimeout(total=30)
+    # One keep-alive pool for the whole run (TLS handshake paid once per host)
+    connector = aiohttp.TCPConnector(limit=8, limit_per_host=8, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        tasks = [fetch_odds(session, sport_key, params) for sport_key in sport_keys]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
 # ============================================================================
 # COMANDO DJANGO
 # ============================================================================
@@ -186,6 +271,11 @@ class Command(BaseCommand):
             default=0.03,
             help='Minimum edge threshold for value (default: 0.03 = 3%)'
         )
+        parser.add_argument(
+            '--ignore-quota',
+            action='store_true',
+            help='Llamar a la API aunque la cuota guardada esté casi agotada'
+        )
 
     def format_table_header(self):
         """Formato de header para la tabla de análisis"""
@@ -204,6 +294,12 @@ class Command(BaseCommand):
                 f"{analysis.grade:>7}{currency}{analysis.stake:>9.2f}"
                 f"{currency}{analysis.ev:>9.2f}{analysis.roi:>6.1f}%")
 
+    def find_team(self, name, teams_by_name):
+        """Resolver un nombre de The Odds API a un Team (búsqueda exacta, sin icontains)"""
+        key = name.lower()
+        alias = TEAM_ALIASES.get(key)
+        return (alias and teams_by_name.get(alias)) or teams_by_name.get(key)
+
     def handle(self, *args, **options):
         days = options['days']
         competitions = options['competitions'].split(',')
@@ -234,40 +330,79 @@ class Command(BaseCommand):
             'CL': 'soccer_uefa_champs_league',
         }
 
-        base_url = "https://api.the-odds-api.com/v4/sports"
-
         total_matches = 0
         total_value_bets = 0
         total_ev = 0
 
+        supported = []
         for comp_code in competitions:
             if comp_code not in SPORT_KEYS:
                 self.stdout.write(self.style.WARNING(f'\n{comp_code}: No soportada'))
                 continue
+            supported.append(comp_code)
+
+        # Cuota de The Odds API conocida de la ejecución anterior
+        quota = read_quota('odds_api')
+        if quota is not None and quota < len(supported) + 2 and not options['ignore_quota']:
+            self.stdout.write(self.style.ERROR(
+                f"\nCuota de The Odds API casi agotada ({quota} requests restantes). "
+                f"Usa --ignore-quota si ya se ha renovado."
+            ))
+            return
 
-            sport_key = SPORT_KEYS[comp_code]
+        # Obtener odds de la API (todas las competiciones en paralelo)
+        params = {
+            'apiKey': api_key,
+            'regions': 'eu,us',
+            'markets': 'h2h,totals,spreads',
+            'oddsFormat': 'decimal'
+        }
+        results = asyncio.run(fetch_all_odds([SPORT_KEYS[c] for c in supported], params))
+
+        # Ventana de partidos (misma para todas las competiciones)
+        now_ts = timezone.now()
+        window_end = now_ts + timedelta(days=days)
 
+        for comp_code, result in zip(supported, results):
             try:
-                # Obtener odds de la API
-                url = f"{base_url}/{sport_key}/odds"
-                params = {
-                    'apiKey': api_key,
-                    'regions': 'eu,us',
-                    'markets': 'h2h,totals,spreads',
-                    'oddsFormat': 'decimal'
-                }
-
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                events = response.json()
+                if isinstance(result, Exception):
+                    raise result
+                events, remaining = result
 
                 if not events:
                     self.stdout.write(f"\n{comp_code}: Sin partidos próximos")
                     continue
 
+                # Salida de la competición acumulada y escrita de una vez
+                buf = []
+
                 # Mostrar header de tabla
-                self.stdout.write(f"\n{comp_code} - {len(events)} partidos encontrados")
-                self.stdout.write(self.format_table_header())
+                buf.append(f"\n{comp_code} - {len(events)} partidos encontrados")
+                buf.append(self.format_table_header())
+
+                # Predicciones de la ventana (una consulta por competición, contra
+                # la réplica de lectura): los eventos sin predicción se descartan
+                # con un fallo de dict
+                predictions = list(
+                    Prediction.objects.using('replica').filter(
+                        match__competition__code=comp_code,
+                        match__status='SCHEDULED',
+                        match__utc_date__gte=now_ts,
+                        match__utc_date__lte=window_end
+                    ).select_related('match__home_team', 'match__away_team').order_by('pk')
+                )
+
+                teams_by_name = {}
+                pred_index = {}
+                for p in predictions:
+                    m = p.match
+                    teams_by_name.setdefault(m.home_team.name.lower(), m.home_team)
+                    teams_by_name.setdefault(m.away_team.name.lower(), m.away_team)
+                    pred_index.setdefault((m.home_team_id, m.away_team_id), p)
+
+                matched = []
+                probs = []
+                odds = []
 
                 # Analizar cada partido
                 for event in events:
@@ -280,7 +415,7 @@ class Command(BaseCommand):
                         continue
 
                     markets = bookmakers[0].get('markets', [])
-                    h2h_market = next((m for m in markets if m['key'] == 'h2h'), None)
+                    h2h_market = {m['key']: m for m in markets}.get('h2h')
 
                     if not h2h_market:
                         continue
@@ -289,66 +424,70 @@ class Command(BaseCommand):
                     if len(outcomes) < 3:
                         continue
 
-                    # Mapear cuotas
+                    # Mapear cuotas: tras sacar local y visitante queda el empate
+                    # (su nombre varía: Draw, Tie, Empate...)
                     odds_map = {o['name']: o['price'] for o in outcomes}
-                    home_odds = odds_map.get(home_team_name)
-                    away_odds = odds_map.get(away_team_name)
-
-                    # Encontrar cuota de empate (puede tener nombre variable)
-                    draw_odds = None
-                    for name, odds in odds_map.items():
-                        if name.lower() in ['draw', 'tie', 'empate']:
-                            draw_odds = odds
-                            break
-
-                    # Si no se encuentra draw por nombre, usar la tercera cuota
-                    if draw_odds is None:
-                        draw_odds = [v for k, v in odds_map.items()
-                                    if k not in [home_team_name, away_team_name]][0]
+                    home_odds = odds_map.pop(home_team_name, None)
+                    away_odds = odds_map.pop(away_team_name, None)
+                    draw_odds = next(iter(odds_map.values()), None)
 
                     if not all([home_odds, draw_odds, away_odds]):
                         continue
 
                     # Buscar predicción del modelo en la base de datos
                     try:
-                        # Buscar partido por nombres de equipos
-                        match = Match.objects.filter(
-                            home_team__name__icontains=home_team_name.split()[-1],
-                            away_team__name__icontains=away_team_name.split()[-1],
-                            status='SCHEDULED',
-                            utc_date__gte=timezone.now(),
-                            utc_date__lte=timezone.now() + timedelta(days=days)
-                        ).select_related('home_team', 'away_team').first()
-
-                        if not match:
-                            self.stdout.write(f"  {home_team_name} vs {away_team_name} - Sin predicción en BD")
-                            continue
-
-                        # Buscar predicción
-                        prediction = Prediction.objects.filter(match=match).first()
+                        # Buscar partido por nombres de equipos (nombre exacto o alias)
+                        home_team = self.find_team(home_team_name, teams_by_name)
+                        away_team = self.find_team(away_team_name, teams_by_name)
+                        prediction = None
+                        if home_team and away_team:
+                            prediction = pred_index.get((home_team.id, away_team.id))
+
+                        if prediction is None:
+                            # Fallback: última palabra contenida en el nombre de BD
+                            home_key = home_team_name.split()[-1].lower()
+                            away_key = away_team_name.split()[-1].lower()
+                            prediction = next((
+                                p for p in pred_index.values()
+                                if home_key in p.match.home_team.name.lower()
+                                and away_key in p.match.away_team.name.lower()
+                            ), None)
 
                         if not prediction:
-                            self.stdout.write(f"  {match.home_team.name} vs {match.away_team.name} - Sin predicción del modelo")
+                            buf.append(f"  {home_team_name} vs {away_team_name} - Sin predicción en BD")
                             continue
 
-                        # Analizar value bets
-                        analysis = analyze_match(
-                            prediction.prob_home,
-                            prediction.prob_draw,
-                            prediction.prob_away,
-                            home_odds,
-                            draw_odds,
-                            away_odds,
-                            bankroll,
-                            kelly_fraction,
-                            min_edge
-                        )
+                        # Reservar la posición de sus filas; se analizan todos juntos
+                        matched.append((len(buf), prediction.match))
+                        buf.append(None)
+                        probs.append((prediction.prob_home, prediction.prob_draw, prediction.prob_away))
+                        odds.append((home_odds, draw_odds, away_odds))
 
+                    except Exception as e:
+                        buf.append(f"  Error analizando {home_team_name} vs {away_team_name}: {e}")
+                        continue
+
+                # Analizar value bets de todos los partidos a la vez
+                if matched:
+                    result = analyze_matches(probs, odds, bankroll, kelly_fraction, min_edge)
+
+                    for i, (pos, match) in enumerate(matched):
                         # Mostrar análisis para cada mercado
-                        for market_name, market_key in [('Home Win', 'home'),
-                                                         ('Draw', 'draw'),
-                                                         ('Away Win', 'away')]:
-                            bet = analysis['analyses'][market_key]
+                        rows = []
+                        for j, (market_name, _) in enumerate(MARKETS):
+                            bet = ValueBet(
+                                outcome=market_name,
+                                model_prob=float(result['model_prob'][i, j]),
+                                odds=float(result['odds'][i, j]),
+                                implied_prob=float(result['implied_prob'][i, j]),
+                                edge=float(result['edge'][i, j]),
+                                grade=str(result['grade'][i, j]),
+                                kelly_fraction=float(result['kelly_fraction'][i, j]),
+                                stake=float(result['stake'][i, j]),
+                                ev=float(result['ev'][i, j]),
+                                roi=float(result['roi'][i, j]),
+                                is_value=bool(result['is_value'][i, j]),
+                            )
                             row = self.format_match_row(
                                 match.home_team.short_name,
                                 match.away_team.short_name,
@@ -358,21 +497,20 @@ class Command(BaseCommand):
 
                             # Colorear según si es value bet
                             if bet.is_value:
-                                self.stdout.write(self.style.SUCCESS(row))
+                                rows.append(self.style.SUCCESS(row))
                                 total_value_bets += 1
                                 total_ev += bet.ev
                             else:
-                                self.stdout.write(row)
+                                rows.append(row)
 
+                        buf[pos] = "\n".join(rows)
                         total_matches += 1
 
-                    except Exception as e:
-                        self.stdout.write(f"  Error analizando {home_team_name} vs {away_team_name}: {e}")
-                        continue
+                self.stdout.write("\n".join(buf))
 
                 # Mostrar uso de API
-                remaining = response.headers.get('x-requests-remaining')
                 if remaining:
+                    save_quota('odds_api', remaining)
                     self.stdout.write(f"\n  API Requests restantes: {remaining}")
 
             except Exception as e:
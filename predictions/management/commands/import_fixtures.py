@@ -4,12 +4,17 @@ Uso: python manage.py import_fixtures --competitions PL,PD
 """
 
 from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from predictions.models import Competition, Team, Match
-import requests
+from predictions.http_cache import cached_get, RequestLog, TTL_LONG
+from asgiref.sync import sync_to_async
+import aiohttp
+import asyncio
+import orjson
 import os
+import sys
 from datetime import datetime
-import time
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -112,6 +117,29 @@ TEAM_NAME_MAPPING = {
     'Stade Rennais FC 1901': 'Rennes',
 }
 
+# Fechas ISO de la API ('2025-08-16T14:00:00Z'): desde Python 3.11
+# fromisoformat acepta el sufijo 'Z' directamente
+if sys.version_info >= (3, 11):
+    parse_iso = datetime.fromisoformat
+else:
+    def parse_iso(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _team_defaults(team_data, name):
+    """short_name/tla para crear un equipo (los fallbacks solo se calculan si faltan)"""
+    return {
+        'short_name': team_data.get('shortName') or name[:20],
+        'tla': team_data.get('tla') or name[:3].upper(),
+    }
+
+
+# Football-Data.org free tier: 10 requests/minuto = 1 cada 6s
+FIXTURES_REQUEST_INTERVAL = 6
+
+# Campos que se actualizan al reimportar un fixture existente
+FIXTURE_UPDATE_FIELDS = ['status', 'utc_date', 'matchday']
+
 
 class Command(BaseCommand):
     help = 'Importa partidos futuros (fixtures) desde Football-Data.org API'
@@ -129,6 +157,11 @@ class Command(BaseCommand):
             default=2025,
             help='Temporada a importar (default: 2025)'
         )
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Ignorar la cache HTTP y volver a descargar los fixtures'
+        )
 
     def handle(self, *args, **options):
         self.stdout.write("="*70)
@@ -146,7 +179,7 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Competiciones: {', '.join(competitions)}")
         self.stdout.write(f"Temporada: {season}")
-        self.stdout.write(f"Rate limit: 10 requests/minuto (espera de 7 segundos entre llamadas)")
+        self.stdout.write(f"Rate limit: 10 requests/minuto (espera de {FIXTURES_REQUEST_INTERVAL} segundos entre llamadas)")
         self.stdout.write("")
 
         # Mapeo de códigos a IDs de football-data.org
@@ -162,7 +195,12 @@ class Command(BaseCommand):
         total_updated = 0
         total_skipped = 0
 
-        for idx, comp_code in enumerate(competitions):
+        # (nombre mapeado, competition_id) -> Team, para toda la ejecución
+        self._name_cache = {}
+
+        # Resolver competiciones antes de llamar a la API
+        targets = []
+        for comp_code in competitions:
             if comp_code not in COMPETITION_IDS:
                 self.stdout.write(self.style.WARNING(f"  {comp_code}: Código no reconocido"))
                 continue
@@ -174,72 +212,275 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING(f"  {comp_code}: No existe en BD, saltando..."))
                 continue
 
-            self.stdout.write(f"\n{competition.name} ({comp_code}):")
-            self.stdout.write("-"*70)
+            targets.append((comp_code, competition))
 
-            # Llamar a la API
-            comp_id = COMPETITION_IDS[comp_code]
-            url = f"https://api.football-data.org/v4/competitions/{comp_id}/matches"
-            headers = {'X-Auth-Token': api_key}
-            params = {'season': season, 'status': 'SCHEDULED'}
+        # Descargar e importar: cada competición se importa en cuanto llegan
+        # sus fixtures, mientras continúan las descargas de las demás
+        results = asyncio.run(self.import_all_fixtures(
+            api_key,
+            [(comp_code, COMPETITION_IDS[comp_code], competition) for comp_code, competition in targets],
+            season,
+            refresh=options['refresh']
+        ))
+
+        for (comp_code, competition), result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.stdout.write(self.style.ERROR(f"  {comp_code}: Error importando: {result}"))
+                continue
 
+            imported, updated, skipped = result
+            total_imported += imported
+            total_updated += updated
+            total_skipped += skipped
+
+        self.stdout.write("")
+        self.stdout.write("="*70)
+        self.stdout.write(self.style.SUCCESS(
+            f'COMPLETADO: {total_imported} importados, {total_updated} actualizados, {total_skipped} omitidos'
+        ))
+        self.stdout.write("="*70)
+
+    async def import_all_fixtures(self, api_key, targets, season, refresh=False):
+        """
+        Descargar e importar fixtures de todas las competiciones
+
+        Args:
+            targets: lista de (comp_code, comp_id, competition)
+
+        Returns:
+            Lista de (importados, actualizados, omitidos) o excepciones, en el orden de targets
+        """
+        semaphore = asyncio.Semaphore(1)
+        self._next_request_at = 0
+        # Llamadas de ejecuciones anteriores también cuentan para el límite
+        self._request_log = RequestLog('football_data', max_requests=10, period=60)
+        timeout = aiohttp.ClientTimeout(total=30)
+        headers = {'X-Auth-Token': api_key}
+        # Una sola conexión keep-alive reutilizada para todas las competiciones
+        connector = aiohttp.TCPConnector(limit=8, limit_per_host=8, ttl_dns_cache=300)
+
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout, connector=connector) as session:
+            tasks = [
+                self.fetch_and_import(session, semaphore, comp_code, comp_id, competition, season, refresh)
+                for comp_code, comp_id, competition in targets
+            ]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_and_import(self, session, semaphore, comp_code, comp_id, competition, season, refresh):
+        """Descargar los fixtures de una competición e importarlos en el hilo del ORM"""
+        try:
+            result = await self.fetch_fixtures(session, semaphore, comp_id, season, refresh)
+        except Exception as e:
+            result = e
+
+        # thread_sensitive (por defecto): las importaciones se ejecutan una a una en
+        # el mismo hilo, sin carreras al crear equipos, solapadas con la red
+        return await sync_to_async(self.import_competition)(comp_code, competition, season, result)
+
+    def import_competition(self, comp_code, competition, season, result):
+        """Importar los fixtures descargados de una competición"""
+        self.stdout.write(f"\n{competition.name} ({comp_code}):")
+        self.stdout.write("-"*70)
+
+        if isinstance(result, Exception):
+            self.stdout.write(self.style.ERROR(f"  Error de conexión: {result}"))
+            return 0, 0, 0
+
+        status_code, body = result
+        if status_code != 200:
+            self.stdout.write(self.style.ERROR(f"  Error API: {status_code}"))
+            self.stdout.write(f"  Response: {body[:200].decode('utf-8', 'replace')}")
+            return 0, 0, 0
+
+        data = orjson.loads(body)
+        matches_data = data.get('matches', [])
+
+        self.stdout.write(f"  Partidos encontrados: {len(matches_data)}")
+
+        imported = 0
+        updated = 0
+        skipped = 0
+
+        # Partidos ya existentes (una consulta por competición)
+        api_ids = [m.get('id') for m in matches_data if m.get('id')]
+        existing_matches = Match.objects.in_bulk(api_ids, field_name='api_id')
+
+        # Equipos referenciados (una consulta por competición)
+        team_api_ids = {m.get('homeTeam', {}).get('id') for m in matches_data}
+        team_api_ids |= {m.get('awayTeam', {}).get('id') for m in matches_data}
+        team_api_ids.discard(None)
+        teams_by_api_id = Team.objects.in_bulk(team_api_ids, field_name='api_id')
+
+        to_upsert = []
+        for match_data in matches_data:
+            outcome, match = self.import_match(
+                match_data, competition, season, existing_matches, teams_by_api_id
+            )
+            if outcome == 'imported':
+                imported += 1
+            elif outcome == 'updated':
+                updated += 1
+            else:
+                skipped += 1
+
+            if match is not None:
+                to_upsert.append((outcome, match))
+
+        # Insertar nuevos / actualizar cambiados en bloque
+        if to_upsert:
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                with transaction.atomic():
+                    self.upsert_matches([match for _, match in to_upsert])
+            except IntegrityError:
+                # Algún fixture ya existe con otro origen (uniq_match_fixture):
+                # reintentar uno a uno para no perder toda la competición
+                for outcome, match in to_upsert:
+                    result = self.save_match_fallback(match, outcome)
+                    if result == outcome:
+                        continue
+                    if outcome == 'imported':
+                        imported -= 1
+                    else:
+                        updated -= 1
+                    if result == 'updated':
+                        updated += 1
+                    else:
+                        skipped += 1
 
-                if response.status_code == 429:
-                    self.stdout.write(self.style.WARNING(f"  Rate limit alcanzado, esperando 60 segundos..."))
-                    time.sleep(60)
-                    response = requests.get(url, headers=headers, params=params, timeout=30)
+        self.stdout.write(self.style.SUCCESS(
+            f"  OK - Importados: {imported}, Actualizados: {updated}, Omitidos: {skipped}"
+        ))
 
-                if response.status_code != 200:
-                    self.stdout.write(self.style.ERROR(f"  Error API: {response.status_code}"))
-                    self.stdout.write(f"  Response: {response.text[:200]}")
-                    continue
+        return imported, updated, skipped
 
-                data = response.json()
-                matches_data = data.get('matches', [])
+    def upsert_matches(self, matches):
+        """Insertar o actualizar partidos por api_id"""
+        Match.objects.bulk_create(
+            matches,
+            update_conflicts=True,
+            unique_fields=['api_id'],
+            update_fields=FIXTURE_UPDATE_FIELDS,
+            batch_size=500
+        )
 
-                self.stdout.write(f"  Partidos encontrados: {len(matches_data)}")
+    def save_match_fallback(self, match, outcome):
+        """
+        Guardar un partido cuyo lote chocó con uniq_match_fixture
 
-                imported = 0
-                updated = 0
-                skipped = 0
+        Si el mismo fixture ya existe sin api_id (importado desde CSV u otra
+        fuente) se le asigna el api_id y se actualiza; si tiene otro api_id
+        se omite.
 
-                for match_data in matches_data:
-                    result = self.import_match(match_data, competition, season)
-                    if result == 'imported':
-                        imported += 1
-                    elif result == 'updated':
-                        updated += 1
-                    else:
-                        skipped += 1
+        Returns:
+            outcome si se guardó tal cual, 'updated' si se asignó el api_id a
+            un fixture existente, o 'skipped'
+        """
+        try:
+            with transaction.atomic():
+                self.upsert_matches([match])
+            return outcome
+        except IntegrityError:
+            pass
 
-                self.stdout.write(self.style.SUCCESS(
-                    f"  OK - Importados: {imported}, Actualizados: {updated}, Omitidos: {skipped}"
-                ))
+        existing = Match.objects.filter(
+            competition=match.competition,
+            season=match.season,
+            home_team=match.home_team,
+            away_team=match.away_team,
+            utc_date=match.utc_date,
+        ).first()
 
-                total_imported += imported
-                total_updated += updated
-                total_skipped += skipped
+        if existing is None or (existing.api_id and existing.api_id != match.api_id):
+            self.stdout.write(self.style.WARNING(
+                f"  Omitido {match.home_team.name} vs {match.away_team.name} "
+                f"(api_id {match.api_id}): fixture duplicado"
+            ))
+            return 'skipped'
 
-                # Esperar 7 segundos entre llamadas (10 requests/min = 1 cada 6s, usamos 7s para margen)
-                if idx < len(competitions) - 1:  # No esperar después del último
-                    self.stdout.write(f"  Esperando 7 segundos (rate limit)...")
-                    time.sleep(7)
+        existing.api_id = match.api_id
+        for field in FIXTURE_UPDATE_FIELDS:
+            setattr(existing, field, getattr(match, field))
+        try:
+            with transaction.atomic():
+                existing.save(update_fields=['api_id', *FIXTURE_UPDATE_FIELDS])
+        except IntegrityError:
+            # api_id ya usado por otro partido con distinta fecha/equipos
+            self.stdout.write(self.style.WARNING(
+                f"  Omitido {match.home_team.name} vs {match.away_team.name} "
+                f"(api_id {match.api_id}): conflicto de api_id"
+            ))
+            return 'skipped'
+        return 'updated'
+
+    async def fetch_fixtures(self, session, semaphore, comp_id, season, refresh=False):
+        """Descargar fixtures de una competición. Devuelve (status, body)"""
+        url = f"https://api.football-data.org/v4/competitions/{comp_id}/matches"
+        params = {'season': season, 'status': 'SCHEDULED'}
+        loop = asyncio.get_running_loop()
+
+        async with semaphore:
+            # Respetar el rate limit sin esperar después de la última llamada
+            wait = max(self._next_request_at - loop.time(), self._request_log.wait_time())
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            # 429 con copia en cache devuelve la copia caducada (sin esperar)
+            response = await cached_get(session, url, params, ttl=TTL_LONG, refresh=refresh)
+
+            if response.status == 429:
+                self._request_log.record()
+                self.stdout.write(self.style.WARNING(f"  Rate limit alcanzado, esperando 60 segundos..."))
+                await asyncio.sleep(60)
+                response = await cached_get(session, url, params, ttl=TTL_LONG, refresh=refresh)
+
+            if not response.from_cache:
+                self._request_log.record()
+                self._next_request_at = loop.time() + FIXTURES_REQUEST_INTERVAL
+
+        return response.status, response.body
+
+    def resolve_team(self, team_data, competition, teams_by_api_id):
+        """Buscar o crear el equipo de un fixture (teams_by_api_id se actualiza)"""
+        name = team_data.get('name')
+        team_api_id = team_data.get('id')
+
+        # 1. Intentar por API_ID (precargados con in_bulk)
+        team = teams_by_api_id.get(team_api_id)
+        if not team:
+            # 2. Usar mapeo manual si existe
+            mapped_name = TEAM_NAME_MAPPING.get(name)
+            if mapped_name:
+                key = (mapped_name, competition.id)
+                if key not in self._name_cache:
+                    self._name_cache[key] = Team.objects.filter(name=mapped_name, competition=competition).first()
+                team = self._name_cache[key]
 
-            except requests.exceptions.RequestException as e:
-                self.stdout.write(self.style.ERROR(f"  Error de conexión: {e}"))
-                continue
+        if not team:
+            # 3. Crear nuevo equipo
+            team = Team.objects.create(
+                api_id=team_api_id,
+                name=name,
+                competition=competition,
+                **_team_defaults(team_data, name)
+            )
+        elif not team.api_id:
+            # Actualizar API_ID si no lo tiene
+            team.api_id = team_api_id
+            team.save(update_fields=['api_id'])
 
-        self.stdout.write("")
-        self.stdout.write("="*70)
-        self.stdout.write(self.style.SUCCESS(
-            f'COMPLETADO: {total_imported} importados, {total_updated} actualizados, {total_skipped} omitidos'
-        ))
-        self.stdout.write("="*70)
+        if team_api_id:
+            teams_by_api_id[team_api_id] = team
+
+        return team
+
+    def import_match(self, match_data, competition, season, existing_matches, teams_by_api_id):
+        """
+        Preparar un partido desde los datos de la API
 
-    def import_match(self, match_data, competition, season):
-        """Importar un partido desde los datos de la API"""
+        Returns:
+            (resultado, Match sin guardar o None): el Match se persiste en
+            bloque con bulk_create(update_conflicts=True) en handle()
+        """
 
         # Extraer información del partido
         api_id = match_data.get('id')
@@ -251,77 +492,32 @@ class Command(BaseCommand):
 
         home_team_name = home_team_data.get('name')
         away_team_name = away_team_data.get('name')
-        home_team_api_id = home_team_data.get('id')
-        away_team_api_id = away_team_data.get('id')
 
         if not all([api_id, utc_date, home_team_name, away_team_name]):
-            return 'skipped'
+            return 'skipped', None
 
         # Parsear fecha
         try:
-            match_date = datetime.fromisoformat(utc_date.replace('Z', '+00:00'))
-        except:
-            return 'skipped'
-
-        # Buscar equipos existentes usando mapeo manual
-        # 1. Intentar por API_ID
-        home_team = Team.objects.filter(api_id=home_team_api_id).first()
-        if not home_team:
-            # 2. Usar mapeo manual si existe
-            mapped_name = TEAM_NAME_MAPPING.get(home_team_name)
-            if mapped_name:
-                home_team = Team.objects.filter(name=mapped_name, competition=competition).first()
+            match_date = parse_iso(utc_date)
+        except ValueError:
+            return 'skipped', None
 
-        if not home_team:
-            # 3. Crear nuevo equipo
-            home_team = Team.objects.create(
-                api_id=home_team_api_id,
-                name=home_team_name,
-                short_name=home_team_data.get('shortName', home_team_name[:20]),
-                tla=home_team_data.get('tla', home_team_name[:3].upper()),
-                competition=competition
-            )
-        else:
-            # Actualizar API_ID si no lo tiene
-            if not home_team.api_id:
-                home_team.api_id = home_team_api_id
-                home_team.save()
-
-        away_team = Team.objects.filter(api_id=away_team_api_id).first()
-        if not away_team:
-            mapped_name = TEAM_NAME_MAPPING.get(away_team_name)
-            if mapped_name:
-                away_team = Team.objects.filter(name=mapped_name, competition=competition).first()
-
-        if not away_team:
-            away_team = Team.objects.create(
-                api_id=away_team_api_id,
-                name=away_team_name,
-                short_name=away_team_data.get('shortName', away_team_name[:20]),
-                tla=away_team_data.get('tla', away_team_name[:3].upper()),
-                competition=competition
-            )
-        else:
-            if not away_team.api_id:
-                away_team.api_id = away_team_api_id
-                away_team.save()
+        # Buscar (o crear) equipos
+        home_team = self.resolve_team(home_team_data, competition, teams_by_api_id)
+        away_team = self.resolve_team(away_team_data, competition, teams_by_api_id)
 
         # Verificar si el partido ya existe
-        existing = Match.objects.filter(
-            api_id=api_id
-        ).first()
+        existing = existing_matches.get(api_id)
 
         if existing:
-            # Actualizar si cambió el status o fecha
-            if existing.status != status or existing.utc_date != match_date:
-                existing.status = status
-                existing.utc_date = match_date
-                existing.save()
-                return 'updated'
-            return 'skipped'
+            # Actualizar solo si cambió el status o fecha
+            if existing.status == status and existing.utc_date == match_date:
+                return 'skipped', None
+            outcome = 'updated'
+        else:
+            outcome = 'imported'
 
-        # Crear nuevo partido
-        Match.objects.create(
+        match = Match(
             api_id=api_id,
             competition=competition,
             season=season,
@@ -332,4 +528,4 @@ class Command(BaseCommand):
             matchday=match_data.get('matchday')
         )
 
-        return 'imported'
+        return outcome, match
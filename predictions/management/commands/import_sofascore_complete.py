@@ -15,22 +15,35 @@ Imports all available data from SofaScore API in a unified way:
 Usage:
     python manage.py import_sofascore_complete --competitions PL --seasons 2024 --all-data
     python manage.py import_sofascore_complete --competitions PL,CL --seasons 2023,2024
-    python manage.py import_sofascore_complete --competitions CL --seasons 2024 --teams-only
+    python manage.py import_sofascore_complete --competitions CL --seasons 2024 --mode teams
+    python manage.py import_sofascore_complete --competitions PL --seasons 2024 --mode teams matches
     python manage.py import_sofascore_complete --competitions PL --seasons 2024 --injuries-only
 """
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import IntegrityError, connection, transaction
 from django.utils import timezone
 from asgiref.sync import sync_to_async
 from predictions.models import Competition, Team, Match, Player, PlayerStats, TeamStats, MatchPlayerStats, MatchIncident, Injury
-from predictions.sofascore_api import SofascoreAPI
+from predictions.sofascore_api import SofascoreAPI, FETCH_ERRORS
 from predictions.scrapers.utils import safe_int, safe_float
 import asyncio
-from datetime import datetime
-import pytz
-import json
+import contextvars
+import functools
+import time
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+import orjson
 import os
+import re
+
+try:
+    # libuv event loop: cheaper I/O polling for the concurrent fetches
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:  # Not installed, or Windows (unsupported)
+    UVLOOP_AVAILABLE = False
 
 
 # SofaScore Tournament IDs
@@ -43,6 +56,179 @@ SOFASCORE_TOURNAMENT_IDS = {
     'CL': 7,       # Champions League
 }
 
+# Rows per INSERT/UPDATE statement for bulk writes
+BULK_BATCH_SIZE = 500
+
+# Columns refreshed on existing rows when --force is used
+TEAM_UPDATE_FIELDS = ['name', 'short_name', 'manager']
+MATCH_DATA_FIELDS = [
+    'status', 'utc_date', 'home_score', 'away_score',
+    'home_score_ht', 'away_score_ht', 'matchday',
+]
+
+# Rows per INSERT for player stats (one row per player per match)
+PLAYER_STATS_BATCH_SIZE = 1000
+
+# Everything but the key is overwritten when a player's match stats are re-imported
+MATCH_PLAYER_STATS_UPDATE_FIELDS = [
+    field.name for field in MatchPlayerStats._meta.concrete_fields
+    if field.name not in ('id', 'match', 'player')
+]
+
+# Matches whose stats/lineups/incidents are fetched at the same time
+MATCH_STATS_CONCURRENCY = 8
+
+# Players processed at the same time in the players phase
+PLAYER_CONCURRENCY = 16
+
+# Global request rate to SofaScore across all concurrent fetches
+SOFASCORE_REQUESTS_PER_SECOND = 10
+
+# Season teams/match lists of finished seasons are cached here
+SOFASCORE_CACHE_DIR = Path(settings.BASE_DIR) / '.cache' / 'sofascore'
+
+# --mode choice -> phases it imports
+IMPORT_MODES = {
+    'all': {'teams', 'matches', 'players', 'standings'},
+    'teams': {'teams'},
+    'matches': {'matches'},
+    'players': {'players'},
+    'standings': {'standings'},
+}
+# Older flags, still accepted: option name -> equivalent --mode
+LEGACY_MODE_FLAGS = {
+    'teams_only': 'teams',
+    'matches_only': 'matches',
+    'players_only': 'players',
+    'standings_only': 'standings',
+}
+
+# Minimum seconds between two progress lines of the same loop
+PROGRESS_LOG_INTERVAL = 1.0
+
+# SofaScore status.type -> Match.status
+MATCH_STATUS_MAP = {
+    'finished': 'FINISHED',
+    'notstarted': 'SCHEDULED',
+    'inprogress': 'IN_PLAY',
+    'postponed': 'POSTPONED',
+    'cancelled': 'CANCELLED',
+    'abandoned': 'CANCELLED',
+}
+
+# Match stat field -> (SofaScore statistic name, statistic key)
+MATCH_STAT_PATTERNS = {
+    'shots': ('Total shots', 'totalShotsOnGoal'),
+    'shots_on_target': ('Shots on target', 'shotsOnTarget'),
+    'shots_off_target': ('Shots off target', 'shotsOffTarget'),
+    'shots_blocked': ('Blocked shots', 'shotsBlocked'),
+    'corners': ('Corner kicks', 'cornerKicks'),
+    'yellow_cards': ('Yellow cards', 'yellowCards'),
+    'red_cards': ('Red cards', 'redCards'),
+    'fouls': ('Fouls', 'fouls'),
+    'offsides': ('Offsides', 'offsides'),
+    'possession': ('Ball possession', 'ballPossession'),
+    'xg': ('Expected goals', 'expectedGoals'),
+    'hit_woodwork': ('Hit woodwork', 'hitWoodwork'),
+}
+# Statistic name or key -> field, for one dict hit per statistic item
+MATCH_STAT_FIELDS = {
+    pattern: field
+    for field, patterns in MATCH_STAT_PATTERNS.items()
+    for pattern in patterns
+}
+# Match columns that imported statistics/details may update
+MATCH_FIELD_NAMES = frozenset(
+    field.name for field in Match._meta.concrete_fields if not field.primary_key
+)
+
+# Converter of each stat copied to Match as <field>_home / <field>_away (xG is a float)
+MATCH_STAT_CONVERTERS = {
+    field: safe_float if field == 'xg' else safe_int
+    for field in MATCH_STAT_PATTERNS
+}
+
+# (field, SofaScore key, converter, default) of the season PlayerStats rows
+PLAYER_STAT_FIELDS = (
+    ('matches_played', 'appearances', safe_int, 0),
+    ('minutes_played', 'minutesPlayed', safe_int, 0),
+    ('goals', 'goals', safe_int, 0),
+    ('assists', 'assists', safe_int, 0),
+    ('xg', 'expectedGoals', safe_float, 0),
+    ('xa', 'expectedAssists', safe_float, 0),
+    ('shots_total', 'shotsTotal', safe_int, 0),
+    ('shots_on_target', 'shotsOnTarget', safe_int, 0),
+    ('passes_completed', 'accuratePass', safe_int, 0),
+    ('passes_attempted', 'totalPass', safe_int, 0),
+    ('key_passes', 'keyPass', safe_int, 0),
+    ('tackles', 'tackles', safe_int, 0),
+    ('interceptions', 'interceptions', safe_int, 0),
+    ('yellow_cards', 'yellowCards', safe_int, 0),
+    ('red_cards', 'redCards', safe_int, 0),
+)
+# Season totals written by extract_player_stats, overwritten on re-import
+PLAYER_STATS_UPDATE_FIELDS = [field for field, *_ in PLAYER_STAT_FIELDS] + ['calculated_at']
+# (field, SofaScore key, converter, default) of the MatchPlayerStats rows
+# (started/substitute/position/shirt number and the card flags are set apart)
+PLAYER_MATCH_STAT_FIELDS = (
+    ('minutes_played', 'minutesPlayed', safe_int, 0),
+    ('rating', 'rating', safe_float, None),
+
+    # Goals & assists
+    ('goals', 'goals', safe_int, 0),
+    ('assists', 'goalAssist', safe_int, 0),
+    ('xg', 'expectedGoals', safe_float, None),
+    ('xa', 'expectedAssists', safe_float, None),
+
+    # Shots
+    ('shots', 'totalShots', safe_int, 0),
+    ('shots_on_target', 'shotsOnTarget', safe_int, 0),
+    ('shots_off_target', 'shotsOffTarget', safe_int, 0),
+    ('shots_blocked', 'blockedShots', safe_int, 0),
+    ('big_chances_missed', 'bigChanceMissed', safe_int, 0),
+
+    # Passes
+    ('passes_completed', 'accuratePass', safe_int, 0),
+    ('passes_attempted', 'totalPass', safe_int, 0),
+    ('key_passes', 'keyPass', safe_int, 0),
+    ('accurate_crosses', 'accurateCross', safe_int, 0),
+    ('total_crosses', 'totalCross', safe_int, 0),
+    ('big_chances_created', 'bigChanceCreated', safe_int, 0),
+
+    # Defensive
+    ('tackles', 'totalTackle', safe_int, 0),
+    ('tackles_won', 'wonTackle', safe_int, 0),
+    ('interceptions', 'interceptions', safe_int, 0),
+    ('clearances', 'clearances', safe_int, 0),
+    ('blocked_shots', 'blockedShots', safe_int, 0),
+
+    # Duels
+    ('duels_won', 'duelWon', safe_int, 0),
+    ('duels_lost', 'duelLost', safe_int, 0),
+    ('aerials_won', 'aerialWon', safe_int, 0),
+    ('aerials_lost', 'aerialLost', safe_int, 0),
+    ('dribbles_successful', 'successfulDribbles', safe_int, 0),
+    ('dribbles_attempted', 'totalDribbles', safe_int, 0),
+    ('was_fouled', 'wasFouled', safe_int, 0),
+
+    # Discipline
+    ('fouls_committed', 'fouls', safe_int, 0),
+
+    # Other
+    ('touches', 'touches', safe_int, 0),
+    ('dispossessed', 'dispossessed', safe_int, 0),
+    ('offsides', 'offsides', safe_int, 0),
+)
+# MatchPlayerStats fields of goalkeepers: the above plus the GK-only ones
+PLAYER_MATCH_GK_STAT_FIELDS = PLAYER_MATCH_STAT_FIELDS + (
+    ('saves', 'saves', safe_int, 0),
+    ('saves_inside_box', 'savesInsideBox', safe_int, 0),
+    ('punches', 'punches', safe_int, 0),
+    ('runs_out', 'goodHighClaim', safe_int, 0),
+    ('successful_runs_out', 'successfulRunsOut', safe_int, 0),
+    ('high_claims', 'highClaims', safe_int, 0),
+)
+
 # Mapping from competition name patterns to codes
 COMPETITION_NAME_MAPPING = {
     'Premier League': 'PL',
@@ -53,27 +239,23 @@ COMPETITION_NAME_MAPPING = {
     'Ligue 1': 'FL1',
     'UEFA Champions League': 'CL',
 }
+# All name patterns in one regex, longest first so a longer pattern wins
+COMPETITION_NAME_RE = re.compile('|'.join(
+    re.escape(pattern)
+    for pattern in sorted(COMPETITION_NAME_MAPPING, key=len, reverse=True)
+))
 
 
+@functools.lru_cache(maxsize=1)
 def load_season_ids():
-    """Load Season IDs from IDS_SOFASCORE.json"""
+    """Load Season IDs from IDS_SOFASCORE.json (parsed once per process)"""
     json_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'IDS_SOFASCORE.json')
 
     if not os.path.exists(json_path):
         return {}
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        content = f.read().strip()
-        # Remove trailing comma and brace if exists
-        if content.endswith(',\n   }'):
-            content = content[:-6] + '\n   }'
-        # Wrap in array if not wrapped
-        if not content.startswith('['):
-            content = '[' + content
-        if not content.endswith(']'):
-            content = content + ']'
-
-        data = json.loads(content)
+    with open(json_path, 'rb') as f:
+        data = orjson.loads(f.read())
 
     # Parse into organized structure: {comp_code: {year: season_id}}
     season_ids = {}
@@ -87,14 +269,10 @@ def load_season_ids():
             continue
 
         # Extract competition code from name
-        comp_code = None
-        for pattern, code in COMPETITION_NAME_MAPPING.items():
-            if pattern in name:
-                comp_code = code
-                break
-
-        if not comp_code:
+        match = COMPETITION_NAME_RE.search(name)
+        if not match:
             continue
+        comp_code = COMPETITION_NAME_MAPPING[match.group(0)]
 
         # Extract year from year_str (e.g., "24/25" -> 2024)
         year_parts = year_str.split('/')
@@ -114,8 +292,42 @@ def load_season_ids():
     return season_ids
 
 
-# Load Season IDs dynamically from JSON
-SOFASCORE_SEASON_IDS = load_season_ids()
+# Lines written by the season import running in the current task, or None
+# to write straight through (see SeasonOutput)
+_season_output = contextvars.ContextVar('season_output', default=None)
+
+
+class SeasonOutput:
+    """
+    Command stdout that buffers what each concurrent season import writes
+
+    Seasons run concurrently; each one's lines are kept together and written
+    as one block when the season finishes (flush).
+    """
+
+    def __init__(self, stdout):
+        self._stdout = stdout
+
+    def write(self, msg='', style_func=None, ending=None):
+        buffer = _season_output.get()
+        if buffer is None:
+            self._stdout.write(msg, style_func, ending)
+        else:
+            buffer.append((msg, style_func, ending))
+
+    def flush(self, buffer):
+        for msg, style_func, ending in buffer:
+            self._stdout.write(msg, style_func, ending)
+        buffer.clear()
+
+    def __getattr__(self, name):
+        return getattr(self._stdout, name)
+
+
+def season_finished(season):
+    """Whether a season (start year) is over, so its SofaScore lists no longer change"""
+    return timezone.now().date() >= date(season + 1, 7, 1)
+
 
 
 class Command(BaseCommand):
@@ -124,6 +336,13 @@ class Command(BaseCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.job_id = None
+        self.force_refetch = False
+        self.verbosity = 1
+        # Teams by GLOBAL api_id, shared by all phases and seasons (see get_teams_map)
+        self.teams_by_api_id = {}
+        # Lineups of concurrently imported matches share players: serialize
+        # the lookup-or-create so a new player is only created once
+        self.player_lock = asyncio.Lock()
 
     async def update_progress(self, percentage, step):
         """Update progress in ImportJob if job_id is set"""
@@ -140,6 +359,45 @@ class Command(BaseCommand):
             except ImportJob.DoesNotExist:
                 pass
 
+    async def get_teams_map(self, api_ids):
+        """
+        Return {api_id: Team} for the given SofaScore team ids
+
+        Only ids not looked up yet are queried, in one query, so the teams,
+        matches and players phases share a single lookup per season. Ids
+        without a team are queried again next time (they may have just been
+        created).
+        """
+        missing = {api_id for api_id in api_ids if api_id not in self.teams_by_api_id}
+        missing.discard(None)
+        if missing:
+            self.teams_by_api_id.update(
+                await Team.objects.ain_bulk(missing, field_name='api_id')
+            )
+        teams = self.teams_by_api_id
+        return {api_id: teams[api_id] for api_id in api_ids if api_id in teams}
+
+    def _progress_logger(self, total):
+        """
+        Return log(idx, message) writing at most one line per PROGRESS_LOG_INTERVAL
+
+        The first and last item are always written; nothing with --verbosity 0.
+        """
+        if self.verbosity < 1:
+            return lambda idx, message: None
+
+        last_write = None
+
+        def log(idx, message):
+            nonlocal last_write
+            now = time.monotonic()
+            if (idx == 1 or idx == total
+                    or now - last_write >= PROGRESS_LOG_INTERVAL):
+                last_write = now
+                self.stdout.write(message)
+
+        return log
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--competitions',
@@ -153,30 +411,36 @@ class Command(BaseCommand):
             required=True,
             help='Comma-separated season years (2023,2024)'
         )
+        parser.add_argument(
+            '--mode',
+            nargs='+',
+            choices=list(IMPORT_MODES),
+            help='Data to import, one or more of: all, teams, matches, players, standings (default: all)'
+        )
         parser.add_argument(
             '--all-data',
             action='store_true',
-            help='Import all data (teams, matches, stats, players)'
+            help='Same as --mode all'
         )
         parser.add_argument(
             '--teams-only',
             action='store_true',
-            help='Only import teams'
+            help='Same as --mode teams'
         )
         parser.add_argument(
             '--matches-only',
             action='store_true',
-            help='Only import matches'
+            help='Same as --mode matches'
         )
         parser.add_argument(
             '--players-only',
             action='store_true',
-            help='Only import players and player stats'
+            help='Same as --mode players'
         )
         parser.add_argument(
             '--standings-only',
             action='store_true',
-            help='Only import team standings/classification'
+            help='Same as --mode standings'
         )
         parser.add_argument(
             '--injuries-only',
@@ -188,6 +452,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Force re-import (overwrite existing data)'
         )
+        parser.add_argument(
+            '--force-refetch',
+            action='store_true',
+            help='Download season teams/matches again instead of using the disk cache'
+        )
         parser.add_argument(
             '--dry-run',
             action='store_true',
@@ -204,26 +473,21 @@ class Command(BaseCommand):
         # Parse arguments
         competitions = options['competitions'].split(',')
         seasons = [int(s) for s in options['seasons'].split(',')]
-        all_data = options['all_data']
-        teams_only = options['teams_only']
-        matches_only = options['matches_only']
-        players_only = options['players_only']
-        standings_only = options['standings_only']
         force = options['force']
         dry_run = options['dry_run']
         self.job_id = options.get('job_id')  # Store for progress tracking
-
-        # If all_data, enable everything except if specific flags are set
-        if all_data:
-            import_teams = not matches_only and not players_only and not standings_only
-            import_matches = not teams_only and not players_only and not standings_only
-            import_players = not teams_only and not matches_only and not standings_only
-            import_standings = not teams_only and not matches_only and not players_only
-        else:
-            import_teams = teams_only or (not matches_only and not players_only and not standings_only)
-            import_matches = matches_only
-            import_players = players_only
-            import_standings = standings_only
+        self.force_refetch = options['force_refetch']
+        self.verbosity = options['verbosity']
+
+        # --mode, or the older *-only flags (which win over --all-data)
+        modes = options['mode']
+        if not modes:
+            modes = [mode for flag, mode in LEGACY_MODE_FLAGS.items() if options[flag]]
+        phases = set().union(*(IMPORT_MODES[mode] for mode in modes or ['all']))
+        import_teams = 'teams' in phases
+        import_matches = 'matches' in phases
+        import_players = 'players' in phases
+        import_standings = 'standings' in phases
 
         # Header
         self.stdout.write("=" * 80)
@@ -249,7 +513,8 @@ class Command(BaseCommand):
         self.stdout.write("")
 
         # Run async import
-        asyncio.run(self.import_complete_async(
+        run = uvloop.run if UVLOOP_AVAILABLE else asyncio.run
+        run(self.import_complete_async(
             competitions, seasons, force, dry_run,
             import_teams, import_matches, import_players, import_standings
         ))
@@ -257,7 +522,15 @@ class Command(BaseCommand):
     async def import_complete_async(self, competitions, seasons, force, dry_run,
                                    import_teams, import_matches, import_players, import_standings):
         """Async wrapper for complete import"""
-        api = SofascoreAPI()
+        api = SofascoreAPI(
+            concurrency=MATCH_STATS_CONCURRENCY,
+            rate=SOFASCORE_REQUESTS_PER_SECOND,
+            cache_dir=SOFASCORE_CACHE_DIR,
+            refresh_cache=self.force_refetch,
+        )
+
+        if not dry_run:
+            await sync_to_async(self._relax_commit_durability)()
 
         # Initialize progress
         await self.update_progress(0, "Iniciando importacion...")
@@ -275,30 +548,52 @@ class Command(BaseCommand):
             'standings_imported': 0,
         }
 
-        try:
-            # Process each competition and season
-            total_items = len(competitions) * len(seasons)
-            current_item = 0
-
-            for comp_code in competitions:
-                for season in seasons:
-                    current_item += 1
-                    self.stdout.write(f"\n{'='*80}")
-                    self.stdout.write(f"{comp_code} - Temporada {season}/{season + 1} ({current_item}/{total_items})")
-                    self.stdout.write("=" * 80)
-
-                    result = await self.import_season_complete(
-                        api, comp_code, season, force, dry_run,
-                        import_teams, import_matches, import_players, import_standings
-                    )
-
-                    if result:
-                        for key in total_stats:
-                            total_stats[key] += result.get(key, 0)
+        # All (competition, season) pairs run concurrently; the shared api
+        # keeps the request rate global
+        pairs = [(comp_code, season) for comp_code in competitions for season in seasons]
+        total_items = len(pairs)
+        stdout = self.stdout
+        output = SeasonOutput(stdout)
+        if total_items > 1:
+            self.stdout = output
+
+        async def import_one(item, comp_code, season):
+            buffer = []
+            if total_items > 1:
+                _season_output.set(buffer)  # Local to this task
+            self.stdout.write(f"\n{'='*80}")
+            self.stdout.write(f"{comp_code} - Temporada {season}/{season + 1} ({item}/{total_items})")
+            self.stdout.write("=" * 80)
+            try:
+                return await self.import_season_complete(
+                    api, comp_code, season, force, dry_run,
+                    import_teams, import_matches, import_players, import_standings
+                )
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"[ERROR] {comp_code} {season}: {e}"))
+                raise
+            finally:
+                output.flush(buffer)
 
+        try:
+            results = await asyncio.gather(
+                *(import_one(item, comp_code, season)
+                  for item, (comp_code, season) in enumerate(pairs, 1)),
+                return_exceptions=True
+            )
         finally:
+            self.stdout = stdout
             await api.close()
 
+        for result in results:
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result  # Cancellation, KeyboardInterrupt...
+                continue  # Already reported in the season's output
+            if result:
+                for key in total_stats:
+                    total_stats[key] += result.get(key, 0)
+
         # Summary
         await self.update_progress(100, "Importacion completada!")
         self.stdout.write("\n" + "=" * 80)
@@ -324,13 +619,29 @@ class Command(BaseCommand):
 
         self.stdout.write("=" * 80)
 
+    def _relax_commit_durability(self):
+        """
+        Don't wait for the WAL fsync on each commit during the import
+
+        The per-match writes of the stats phase can't share a transaction
+        (they are interleaved with minutes of HTTP fetching), so relax the
+        cost of their many small commits instead. The import is
+        reproducible, so losing the last commits on a power cut is fine.
+        Async ORM calls all run on the same thread, hence on this connection.
+        """
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SET synchronous_commit = off")
+            elif connection.vendor == 'sqlite':
+                cursor.execute("PRAGMA synchronous = NORMAL")
+
     async def import_season_complete(self, api, comp_code, season, force, dry_run,
                                     import_teams, import_matches, import_players, import_standings):
         """Import all data for one competition/season"""
 
         try:
             # Get competition
-            competition = await sync_to_async(Competition.objects.get)(code=comp_code)
+            competition = await Competition.objects.aget(code=comp_code)
         except Competition.DoesNotExist:
             self.stdout.write(
                 self.style.ERROR(f"[ERROR] Competicion {comp_code} no encontrada en BD")
@@ -346,9 +657,7 @@ class Command(BaseCommand):
             return None
 
         # Get season ID from dynamically loaded IDs
-        season_id = None
-        if comp_code in SOFASCORE_SEASON_IDS:
-            season_id = SOFASCORE_SEASON_IDS[comp_code].get(season)
+        season_id = load_season_ids().get(comp_code, {}).get(season)
 
         if not season_id:
             self.stdout.write(
@@ -357,8 +666,9 @@ class Command(BaseCommand):
             return None
 
         # Update competition with SofaScore ID
-        if not dry_run:
-            await sync_to_async(self._update_competition)(competition, tournament_id)
+        if not dry_run and competition.api_id != tournament_id:
+            competition.api_id = tournament_id
+            await competition.asave(update_fields=['api_id'])
 
         result = {
             'teams_created': 0,
@@ -441,19 +751,15 @@ class Command(BaseCommand):
         await self.update_progress(95, f"Completado: {comp_code} {season}")
         return result
 
-    def _update_competition(self, competition, tournament_id):
-        """Update competition with SofaScore tournament ID"""
-        if not competition.api_id or competition.api_id != str(tournament_id):
-            competition.api_id = str(tournament_id)
-            competition.save()
-
     async def import_teams(self, api, competition, tournament_id, season_id,
                           season, force, dry_run):
         """Import teams - avoiding duplicates using global api_id lookup"""
         result = {'teams_created': 0, 'teams_updated': 0}
 
         try:
-            teams_data = await api.get_season_teams(tournament_id, season_id)
+            teams_data = await api.get_season_teams(
+                tournament_id, season_id, cached=season_finished(season)
+            )
 
             if not teams_data or 'teams' not in teams_data:
                 self.stdout.write(self.style.WARNING("[WARN] No teams found"))
@@ -463,24 +769,38 @@ class Command(BaseCommand):
             total_teams = len(teams_list)
             self.stdout.write(f"    Procesando {total_teams} equipos...")
 
+            # GLOBAL lookup by api_id (not filtered by competition), one query
+            # for the whole season instead of one per team
+            team_ids = [t.get('id') for t in teams_list if t.get('id')]
+            existing_teams = {}
+            if not dry_run:
+                existing_teams = await self.get_teams_map(team_ids)
+
+            to_create = []
+            to_update = []
+            log_progress = self._progress_logger(total_teams)
+
             for idx, team_info in enumerate(teams_list, 1):
                 try:
                     team_name = team_info.get('name', 'Unknown')
                     team_id = team_info.get('id', 'N/A')
 
-                    # Log cada 10 equipos o el primero/último
-                    if idx % 10 == 0 or idx == 1 or idx == total_teams:
-                        self.stdout.write(f"      [{idx}/{total_teams}] {team_name} (ID: {team_id})")
+                    log_progress(idx, f"      [{idx}/{total_teams}] {team_name} (ID: {team_id})")
 
-                    team_result = await self.process_team_global(
-                        team_info, competition, dry_run, force, api
+                    team_result = await self.prepare_team(
+                        team_info, competition, existing_teams, dry_run, force, api
                     )
 
-                    if team_result == 'created':
+                    if team_result is None:
+                        continue
+
+                    action, team = team_result
+                    if action == 'created':
+                        if team is not None:
+                            to_create.append(team)
                         result['teams_created'] += 1
-                        if idx % 10 != 0:  # Solo mostrar si no se mostró arriba
-                            self.stdout.write(f"[{idx}/{total_teams}] ✓ {team_name} - CREADO")
-                    elif team_result == 'updated':
+                    else:
+                        to_update.append(team)
                         result['teams_updated'] += 1
 
                 except Exception as e:
@@ -490,25 +810,36 @@ class Command(BaseCommand):
                     )
                     continue
 
+            if to_create or to_update:
+                await sync_to_async(self._save_teams)(to_create, to_update)
+
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"  [ERROR] {e}"))
 
         return result
 
-    async def process_team_global(self, team_info, competition, dry_run, force, api=None):
+    async def prepare_team(self, team_info, competition, existing_teams, dry_run, force, api=None):
         """
-        Process team using GLOBAL api_id lookup (no competition filter)
-        This prevents duplicates across competitions
+        Build the Team to create or update for a SofaScore team entry
+
+        Teams are looked up by GLOBAL api_id (no competition filter), which
+        prevents duplicates across competitions. Returns ('created', Team),
+        ('updated', Team) or None when there is nothing to write (including
+        an existing team whose values didn't change).
         """
         team_name = team_info.get('name', '')
         team_id = team_info.get('id')
         short_name = team_info.get('shortName', team_name[:50])
 
         if not team_name or not team_id:
-            return 'skipped'
+            return None
 
         if dry_run:
-            return 'created'
+            return 'created', None
+
+        existing_team = existing_teams.get(team_id)
+        if existing_team and not force:
+            return None
 
         # Extract manager from team_info if available
         manager_name = None
@@ -524,50 +855,35 @@ class Command(BaseCommand):
                     manager_data = team_details['team'].get('manager', {})
                     if manager_data:
                         manager_name = manager_data.get('name')
-            except Exception:
+            except FETCH_ERRORS:
                 pass  # Continue without manager if fetch fails
 
-        # GLOBAL lookup by api_id (not filtered by competition)
-        existing_team = await sync_to_async(
-            Team.objects.filter(api_id=team_id).first
-        )()
-
         if existing_team:
-            # Team exists globally - just update if needed
-            if force:
-                await sync_to_async(self._update_team)(
-                    existing_team, team_name, short_name, manager_name
-                )
-                return 'updated'
-            return 'skipped'
+            # Team exists globally - just update it, if anything changed
+            values = {'name': team_name, 'short_name': short_name}
+            if manager_name:
+                values['manager'] = manager_name
+            if all(getattr(existing_team, key) == value for key, value in values.items()):
+                return None
+            for key, value in values.items():
+                setattr(existing_team, key, value)
+            return 'updated', existing_team
 
         # Create new team (linked to primary competition)
-        await sync_to_async(self._create_team)(
-            competition, team_name, short_name, team_id, manager_name
+        return 'created', Team(
+            competition=competition,
+            name=team_name,
+            short_name=short_name,
+            api_id=team_id,
+            manager=manager_name
         )
 
-        return 'created'
-
-    def _update_team(self, team, name, short_name, manager=None):
-        """Update team info"""
-        team.name = name
-        team.short_name = short_name
-        if manager:
-            team.manager = manager
-        team.save()
-
-    def _create_team(self, competition, name, short_name, api_id, manager=None):
-        """Create new team"""
-        try:
-            Team.objects.create(
-                competition=competition,
-                name=name,
-                short_name=short_name,
-                api_id=api_id,
-                manager=manager
-            )
-        except Exception:
-            pass  # Ignore if already exists due to race condition
+    def _save_teams(self, to_create, to_update):
+        """Insert new teams and update existing ones in one transaction"""
+        with transaction.atomic():
+            # Ignore teams inserted by a concurrent import since the lookup
+            Team.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+            Team.objects.bulk_update(to_update, TEAM_UPDATE_FIELDS, batch_size=BULK_BATCH_SIZE)
 
     async def import_matches_with_stats(self, api, competition, tournament_id, season_id,
                                        season, force, dry_run):
@@ -575,7 +891,9 @@ class Command(BaseCommand):
         result = {'matches_created': 0, 'matches_updated': 0, 'stats_imported': 0}
 
         try:
-            matches_data = await api.get_season_matches(tournament_id, season_id, status='all')
+            matches_data = await api.get_season_matches(
+                tournament_id, season_id, status='all', cached=season_finished(season)
+            )
 
             if not matches_data:
                 return result
@@ -583,149 +901,242 @@ class Command(BaseCommand):
             total_matches = len(matches_data)
             self.stdout.write(f"Procesando {total_matches} partidos...")
 
+            # Teams (by GLOBAL api_id) and existing matches of the season in
+            # one query each, keyed by SofaScore id
+            team_ids = set()
+            for m in matches_data:
+                team_ids.add((m.get('homeTeam') or {}).get('id'))
+                team_ids.add((m.get('awayTeam') or {}).get('id'))
+            teams_map = await self.get_teams_map(team_ids)
+
+            event_ids = [m.get('id') for m in matches_data if m.get('id')]
+            existing_matches = {}
+            if not dry_run and force:
+                existing_matches = await Match.objects.ain_bulk(event_ids, field_name='api_id')
+            elif not dry_run:
+                # Existing matches are skipped without --force: ids are enough
+                existing_matches = {
+                    api_id: None
+                    async for api_id in Match.objects.filter(
+                        api_id__in=event_ids
+                    ).values_list('api_id', flat=True)
+                }
+
+            to_create = []
+            to_update = []
+            # Finished matches whose stats must be imported
+            pending_stats = []
+            log_progress = self._progress_logger(total_matches)
+
             for idx, match_info in enumerate(matches_data, 1):
+                # Nested objects read once and shared with prepare_match
+                home_info = match_info.get('homeTeam') or {}
+                away_info = match_info.get('awayTeam') or {}
+                home_team_name = home_info.get('name', 'Unknown')
+                away_team_name = away_info.get('name', 'Unknown')
                 try:
-                    home_team_name = match_info.get('homeTeam', {}).get('name', 'Unknown')
-                    away_team_name = match_info.get('awayTeam', {}).get('name', 'Unknown')
-                    match_status = match_info.get('status', {}).get('type', 'unknown')
+                    match_status = (match_info.get('status') or {}).get('type', 'unknown')
                     match_id = match_info.get('id', 'N/A')
 
-                    # Log cada 10 partidos o el primero/último
-                    if idx % 10 == 0 or idx == 1 or idx == total_matches:
-                        self.stdout.write(
-                            f"[{idx}/{total_matches}] {home_team_name} vs {away_team_name} "
-                            f"(ID: {match_id}, Status: {match_status})"
-                        )
+                    log_progress(
+                        idx,
+                        f"[{idx}/{total_matches}] {home_team_name} vs {away_team_name} "
+                        f"(ID: {match_id}, Status: {match_status})"
+                    )
 
-                    match_result, has_stats = await self.process_match_with_stats(
-                        match_info, competition, season, dry_run, force, api
+                    match_result = self.prepare_match(
+                        match_info, home_info, away_info, match_status,
+                        competition, season, teams_map, existing_matches,
+                        dry_run, force
                     )
 
-                    if match_result == 'created':
+                    if match_result is None:
+                        continue
+
+                    action, match_obj = match_result
+                    if action == 'created':
                         result['matches_created'] += 1
-                        if has_stats:
-                            result['stats_imported'] += 1
-                        # Mostrar confirmación para partidos creados
-                        if idx % 10 != 0 and idx != 1 and idx != total_matches:
-                            stats_msg = " + stats" if has_stats else ""
-                            self.stdout.write(
-                                f"[{idx}/{total_matches}] ✓ {home_team_name} vs {away_team_name} - CREADO{stats_msg}"
-                            )
-                    elif match_result == 'updated':
+                        if match_obj is not None:
+                            to_create.append(match_obj)
+                    elif action == 'updated':
                         result['matches_updated'] += 1
-                        if has_stats:
-                            result['stats_imported'] += 1
-                        # Mostrar confirmación para partidos actualizados
-                        if idx % 10 != 0 and idx != 1 and idx != total_matches:
-                            stats_msg = " + stats" if has_stats else ""
-                            self.stdout.write(
-                                f"[{idx}/{total_matches}] ↻ {home_team_name} vs {away_team_name} - ACTUALIZADO{stats_msg}"
-                            )
-
-                    # Mostrar progreso cada 10 partidos
-                    if idx % 10 == 0:
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Progreso: {idx}/{total_matches} - "
-                                f"Creados: {result['matches_created']}, "
-                                f"Actualizados: {result['matches_updated']}, "
-                                f"Con stats: {result['stats_imported']}"
-                            )
-                        )
+                        to_update.append(match_obj)
+
+                    if match_obj is not None and match_status == 'finished':
+                        pending_stats.append(match_obj)
 
                 except Exception as e:
-                    home_team_name = match_info.get('homeTeam', {}).get('name', 'Unknown')
-                    away_team_name = match_info.get('awayTeam', {}).get('name', 'Unknown')
                     self.stdout.write(
                         self.style.WARNING(f"[{idx}/{total_matches}] ✗ {home_team_name} vs {away_team_name}: {e}")
                     )
                     continue
 
+            if to_create or to_update:
+                failed = await sync_to_async(self._save_matches)(to_create, to_update)
+                for match_obj in failed:
+                    result['matches_created'] -= 1
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"✗ {match_obj.home_team.name} vs {match_obj.away_team.name}: "
+                            f"no se pudo crear (ID: {match_obj.api_id})"
+                        )
+                    )
+                if failed:
+                    failed_ids = {m.api_id for m in failed}
+                    pending_stats = [m for m in pending_stats if m.api_id not in failed_ids]
+
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Guardados: {result['matches_created']} creados, "
+                        f"{result['matches_updated']} actualizados"
+                    )
+                )
+
+            # Import match statistics of finished matches, several at a time.
+            # Player stats of all matches are saved together at the end
+            semaphore = asyncio.Semaphore(MATCH_STATS_CONCURRENCY)
+            player_stats_rows = []
+
+            async def import_stats(match_obj):
+                async with semaphore:
+                    return await self.import_match_stats(
+                        api, match_obj, match_obj.api_id, force, player_stats_rows
+                    )
+
+            tasks = [asyncio.create_task(import_stats(m)) for m in pending_stats]
+            total_stats = len(tasks)
+            log_progress = self._progress_logger(total_stats)
+            try:
+                for stats_idx, task in enumerate(asyncio.as_completed(tasks), 1):
+                    if await task:
+                        result['stats_imported'] += 1
+
+                    log_progress(
+                        stats_idx,
+                        self.style.SUCCESS(
+                            f"Progreso stats: {stats_idx}/{total_stats} - "
+                            f"Con stats: {result['stats_imported']}"
+                        )
+                    )
+            finally:
+                # Don't leave fetches running if one match failed unexpectedly
+                for task in tasks:
+                    task.cancel()
+
+            if player_stats_rows:
+                await sync_to_async(self._save_match_player_stats)(player_stats_rows)
+
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"[ERROR] {e}"))
 
         return result
 
-    async def process_match_with_stats(self, match_info, competition, season,
-                                      dry_run, force, api):
-        """Process single match with statistics"""
+    def prepare_match(self, match_info, home_team_info, away_team_info, status,
+                      competition, season, teams_map, existing_matches, dry_run, force):
+        """
+        Build the Match to create or update for a SofaScore event
+
+        home_team_info, away_team_info and status are the event's homeTeam,
+        awayTeam and status.type, already read by the caller. existing_matches
+        maps api_id to the Match, or to None when not forcing.
+        Returns ('created', Match), ('updated', Match), ('unchanged', Match)
+        when forcing an existing match whose data is already up to date, or
+        None when the match is skipped. Nothing is written here; see
+        _save_matches.
+        """
         event_id = match_info.get('id')
-        home_team_info = match_info.get('homeTeam', {})
-        away_team_info = match_info.get('awayTeam', {})
-
         home_team_id = home_team_info.get('id')
         away_team_id = away_team_info.get('id')
 
         if not event_id or not home_team_id or not away_team_id:
-            return 'skipped', False
-
-        # Find teams by GLOBAL api_id
-        home_team = await sync_to_async(
-            Team.objects.filter(api_id=home_team_id).first
-        )()
+            return None
 
-        away_team = await sync_to_async(
-            Team.objects.filter(api_id=away_team_id).first
-        )()
+        home_team = teams_map.get(home_team_id)
+        away_team = teams_map.get(away_team_id)
 
         if not home_team or not away_team:
-            return 'skipped', False
+            return None
 
         if dry_run:
-            return 'created', False
+            return 'created', None
 
         # Extract match data
-        match_data = self.extract_match_data(match_info)
-
-        # Check if match exists
-        existing_match = await sync_to_async(
-            Match.objects.filter(api_id=event_id).first
-        )()
-
-        match_obj = None
-        if existing_match:
-            if force:
-                await sync_to_async(self._update_match)(existing_match, match_data)
-                match_obj = existing_match
-            else:
-                return 'skipped', False
-        else:
-            match_obj = await sync_to_async(self._create_match)(
-                competition, home_team, away_team, season, event_id, match_data
-            )
-
-        # Import match statistics if finished
-        has_stats = False
-        if match_obj and match_info.get('status', {}).get('type') == 'finished':
-            try:
-                has_stats = await self.import_match_stats(api, match_obj, event_id, force)
-            except Exception:
-                pass
+        match_data = self.extract_match_data(match_info, status)
+
+        if event_id in existing_matches:
+            if not force:
+                return None
+            existing_match = existing_matches[event_id]
+            changed = False
+            for key, value in match_data.items():
+                if value is not None and getattr(existing_match, key) != value:
+                    setattr(existing_match, key, value)
+                    changed = True
+            # Cache the teams so stats import can use them from async code
+            existing_match.home_team = home_team
+            existing_match.away_team = away_team
+            return ('updated' if changed else 'unchanged'), existing_match
+
+        return 'created', Match(
+            competition=competition,
+            season=season,
+            home_team=home_team,
+            away_team=away_team,
+            api_id=event_id,
+            **match_data
+        )
 
-        return ('created' if not existing_match else 'updated'), has_stats
+    def _save_matches(self, to_create, to_update):
+        """
+        Insert new matches and update existing ones in one transaction
 
-    def extract_match_data(self, match_info):
+        Returns the new matches that could not be inserted. If the batch
+        insert hits a constraint (e.g. the same fixture already imported
+        from another source without api_id) the rows are retried one by
+        one so a single conflict doesn't drop the whole season.
+        """
+        failed = []
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Match.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+            except IntegrityError:
+                for match_obj in to_create:
+                    match_obj.pk = None
+                    try:
+                        with transaction.atomic():
+                            match_obj.save(force_insert=True)
+                    except IntegrityError:
+                        failed.append(match_obj)
+
+            Match.objects.bulk_update(to_update, MATCH_DATA_FIELDS, batch_size=BULK_BATCH_SIZE)
+
+        # Backends that can't return ids from a bulk insert leave pk unset
+        missing = [m for m in to_create if m.pk is None and m not in failed]
+        if missing:
+            saved = Match.objects.in_bulk([m.api_id for m in missing], field_name='api_id')
+            for match_obj in missing:
+                if match_obj.api_id in saved:
+                    match_obj.pk = saved[match_obj.api_id].pk
+
+        return failed
+
+    def extract_match_data(self, match_info, status=None):
         """Extract match data from SofaScore response"""
-        status_map = {
-            'finished': 'FINISHED',
-            'notstarted': 'SCHEDULED',
-            'inprogress': 'IN_PLAY',
-            'postponed': 'POSTPONED',
-            'cancelled': 'CANCELLED',
-            'abandoned': 'CANCELLED',
-        }
+        if status is None:
+            status = (match_info.get('status') or {}).get('type', '')
+        mapped_status = MATCH_STATUS_MAP.get(status.lower(), 'SCHEDULED')
 
-        status = match_info.get('status', {}).get('type', '').lower()
-        mapped_status = status_map.get(status, 'SCHEDULED')
-
-        home_score = match_info.get('homeScore', {}).get('current')
-        away_score = match_info.get('awayScore', {}).get('current')
-        ht_home = match_info.get('homeScore', {}).get('period1')
-        ht_away = match_info.get('awayScore', {}).get('period1')
+        home_score_info = match_info.get('homeScore') or {}
+        away_score_info = match_info.get('awayScore') or {}
+        home_score = home_score_info.get('current')
+        away_score = away_score_info.get('current')
+        ht_home = home_score_info.get('period1')
+        ht_away = away_score_info.get('period1')
 
         start_timestamp = match_info.get('startTimestamp')
         if start_timestamp:
-            utc_date = datetime.utcfromtimestamp(start_timestamp).replace(tzinfo=pytz.UTC)
+            utc_date = datetime.fromtimestamp(start_timestamp, tz=dt_timezone.utc)
         else:
             utc_date = None
 
@@ -745,26 +1156,16 @@ class Command(BaseCommand):
             'matchday': safe_int(matchday),
         }
 
-    def _update_match(self, match, data):
-        """Update match"""
-        for key, value in data.items():
-            if value is not None:
-                setattr(match, key, value)
-        match.save()
-
-    def _create_match(self, competition, home_team, away_team, season, event_id, data):
-        """Create match"""
-        return Match.objects.create(
-            competition=competition,
-            season=season,
-            home_team=home_team,
-            away_team=away_team,
-            api_id=event_id,
-            **data
-        )
+    async def import_match_stats(self, api, match, event_id, force=False,
+                                 player_stats_rows=None):
+        """
+        Import match statistics, player statistics, and incidents
 
-    async def import_match_stats(self, api, match, event_id, force=False):
-        """Import match statistics, player statistics, and incidents"""
+        Player stats rows are appended to player_stats_rows, for the caller
+        to save in one bulk write, or saved here when it is None.
+        Fetch failures and unexpected payloads are reported and the match is
+        skipped; any other error propagates.
+        """
         try:
             match_data = await api.get_match_complete_data(event_id)
 
@@ -773,6 +1174,8 @@ class Command(BaseCommand):
 
             has_match_stats = False
             has_player_stats = False
+            # Details and statistics are saved together in one UPDATE
+            match_fields = {}
 
             # Extract referee and venue from match details
             if 'details' in match_data and match_data['details']:
@@ -782,20 +1185,12 @@ class Command(BaseCommand):
                 # Extract referee
                 referee_data = event_data.get('referee', {})
                 if referee_data:
-                    referee_name = referee_data.get('name')
-                    if referee_name:
-                        await sync_to_async(self._update_match_details)(
-                            match, {'referee': referee_name}
-                        )
+                    match_fields['referee'] = referee_data.get('name')
 
                 # Extract venue
                 venue_data = event_data.get('venue', {})
                 if venue_data:
-                    venue_name = venue_data.get('stadium', {}).get('name')
-                    if venue_name:
-                        await sync_to_async(self._update_match_details)(
-                            match, {'venue': venue_name}
-                        )
+                    match_fields['venue'] = venue_data.get('stadium', {}).get('name')
 
             # Import match-level statistics
             if 'statistics' in match_data:
@@ -803,91 +1198,81 @@ class Command(BaseCommand):
                 stats = self.extract_match_statistics(statistics)
 
                 if stats:
-                    await sync_to_async(self._update_match_stats)(match, stats)
+                    match_fields.update(stats)
                     has_match_stats = True
 
+            await self._update_match_fields(match, match_fields)
+
             # Import player statistics from lineups
             if 'lineups' in match_data:
                 lineups = match_data.get('lineups', {})
-                player_count = await self.import_match_player_stats(match, lineups, force)
-                if player_count > 0:
+                rows = await self.build_match_player_stats(match, lineups)
+                if rows:
                     has_player_stats = True
+                    if player_stats_rows is None:
+                        await sync_to_async(self._save_match_player_stats)(rows)
+                    else:
+                        player_stats_rows.extend(rows)
 
             # Import match incidents (goals, cards, substitutions)
             # Only import if force=True OR if match has no incidents yet
             should_import_incidents = force
             if not should_import_incidents:
                 # Check if match already has incidents
-                has_incidents = await sync_to_async(
-                    lambda: match.incidents.exists()
-                )()
+                has_incidents = await match.incidents.aexists()
                 should_import_incidents = not has_incidents
 
             if should_import_incidents:
-                try:
-                    incidents_count = await self.import_match_incidents(api, match, event_id)
-                    if incidents_count > 0:
-                        has_match_stats = True
-                except Exception:
-                    pass  # Continue if incidents fetch fails
+                incidents_count = await self.import_match_incidents(api, match, event_id)
+                if incidents_count > 0:
+                    has_match_stats = True
 
             # Import advanced match data (momentum graph, shotmap, best players)
-            try:
-                await self.import_match_advanced_data(api, match, event_id, force)
-            except Exception:
-                pass  # Continue if advanced data fetch fails
+            await self.import_match_advanced_data(api, match, event_id, force)
 
             return has_match_stats or has_player_stats
 
-        except Exception:
-            pass
+        except (*FETCH_ERRORS, KeyError) as e:
+            self.stdout.write(
+                self.style.WARNING(f"✗ Stats {event_id}: {type(e).__name__}: {e}")
+            )
 
         return False
 
     async def import_match_advanced_data(self, api, match, event_id, force=False):
         """Import advanced match data: momentum graph, shotmap, best players"""
-        try:
-            # Only import if force=True OR if match doesn't have this data yet
-            should_import = force or not match.momentum_graph
+        # Only import if force=True OR if match doesn't have this data yet
+        should_import = force or not match.momentum_graph
 
-            if should_import:
-                # Get momentum graph
-                try:
-                    graph_data = await api.get_match_graph(event_id)
-                    if graph_data and 'graphPoints' in graph_data:
-                        await sync_to_async(self._update_match_field)(
-                            match, 'momentum_graph', graph_data
-                        )
-                except Exception:
-                    pass
+        if should_import:
+            advanced = {}
 
-                # Get shotmap
-                try:
-                    shotmap_data = await api.get_match_shotmap(event_id)
-                    if shotmap_data and 'shotmap' in shotmap_data:
-                        await sync_to_async(self._update_match_field)(
-                            match, 'shotmap_data', shotmap_data
-                        )
-                except Exception:
-                    pass
+            # Get momentum graph (not every match has one)
+            try:
+                graph_data = await api.get_match_graph(event_id)
+                if graph_data and 'graphPoints' in graph_data:
+                    advanced['momentum_graph'] = graph_data
+            except FETCH_ERRORS:
+                pass
 
-                # Get best players
-                try:
-                    best_players_data = await api.get_match_best_players(event_id)
-                    if best_players_data:
-                        await sync_to_async(self._update_match_field)(
-                            match, 'best_players', best_players_data
-                        )
-                except Exception:
-                    pass
+            # Get shotmap
+            try:
+                shotmap_data = await api.get_match_shotmap(event_id)
+                if shotmap_data and 'shotmap' in shotmap_data:
+                    advanced['shotmap_data'] = shotmap_data
+            except FETCH_ERRORS:
+                pass
 
-        except Exception:
-            pass
+            # Get best players
+            try:
+                best_players_data = await api.get_match_best_players(event_id)
+                if best_players_data:
+                    advanced['best_players'] = best_players_data
+            except FETCH_ERRORS:
+                pass
 
-    def _update_match_field(self, match, field_name, value):
-        """Update a specific field in the match"""
-        setattr(match, field_name, value)
-        match.save(update_fields=[field_name])
+            # One UPDATE for everything that was fetched
+            await self._update_match_fields(match, advanced)
 
     def extract_match_statistics(self, statistics):
         """Extract match statistics from all periods (ALL, 1ST_HALF, 2ND_HALF)"""
@@ -903,45 +1288,25 @@ class Command(BaseCommand):
 
         # Extract data from all periods
         for period_stats in stats_list:
-            period = period_stats.get('period')
-            if period not in period_data:
+            period_fields = period_data.get(period_stats.get('period'))
+            if period_fields is None:
                 continue
 
-            groups = period_stats.get('groups', [])
-            for group in groups:
-                stats_items = group.get('statisticsItems', [])
-
-                for stat in stats_items:
-                    name = stat.get('name', '')
-                    key = stat.get('key', '')
-                    home_val = stat.get('homeValue', stat.get('home'))
-                    away_val = stat.get('awayValue', stat.get('away'))
-
-                    # Map stat to field name
-                    field_mapping = {
-                        'shots': ('Total shots', 'totalShotsOnGoal'),
-                        'shots_on_target': ('Shots on target', 'shotsOnTarget'),
-                        'shots_off_target': ('Shots off target', 'shotsOffTarget'),
-                        'shots_blocked': ('Blocked shots', 'shotsBlocked'),
-                        'corners': ('Corner kicks', 'cornerKicks'),
-                        'yellow_cards': ('Yellow cards', 'yellowCards'),
-                        'red_cards': ('Red cards', 'redCards'),
-                        'fouls': ('Fouls', 'fouls'),
-                        'offsides': ('Offsides', 'offsides'),
-                        'possession': ('Ball possession', 'ballPossession'),
-                        'xg': ('Expected goals', 'expectedGoals'),
-                        'hit_woodwork': ('Hit woodwork', 'hitWoodwork'),
+            for group in period_stats.get('groups', []):
+                for stat in group.get('statisticsItems', []):
+                    # Map stat to field name, by key first then by display name
+                    field = (MATCH_STAT_FIELDS.get(stat.get('key'))
+                             or MATCH_STAT_FIELDS.get(stat.get('name')))
+                    if field is None:
+                        continue
+
+                    period_fields[field] = {
+                        'home': stat.get('homeValue', stat.get('home')),
+                        'away': stat.get('awayValue', stat.get('away')),
                     }
 
-                    for field, patterns in field_mapping.items():
-                        if any(pattern in name or key == pattern for pattern in patterns if isinstance(pattern, str)):
-                            period_data[period][field] = {
-                                'home': home_val,
-                                'away': away_val
-                            }
-
         # Priority: Use ALL if available, otherwise sum 1ST_HALF + 2ND_HALF
-        def get_stat_value(field, team):
+        def get_stat_value(field, team, convert):
             """Get stat value with fallback logic"""
             # Try ALL first
             if field in period_data['ALL'] and period_data['ALL'][field][team] is not None:
@@ -954,7 +1319,7 @@ class Command(BaseCommand):
             if first_half is not None and second_half is not None:
                 # Sum numeric values
                 try:
-                    return safe_int(first_half) + safe_int(second_half)
+                    return convert(first_half) + convert(second_half)
                 except (ValueError, TypeError):
                     pass
 
@@ -962,50 +1327,29 @@ class Command(BaseCommand):
             return first_half if first_half is not None else second_half
 
         # Build result with fallback logic
-        stat_fields = [
-            'shots', 'shots_on_target', 'shots_off_target', 'shots_blocked',
-            'corners', 'yellow_cards', 'red_cards', 'fouls', 'offsides', 'possession', 'hit_woodwork'
-        ]
-
-        for field in stat_fields:
-            home_val = get_stat_value(field, 'home')
-            away_val = get_stat_value(field, 'away')
+        for field, convert in MATCH_STAT_CONVERTERS.items():
+            home_val = get_stat_value(field, 'home', convert)
+            away_val = get_stat_value(field, 'away', convert)
 
             if home_val is not None:
-                if field == 'possession':
-                    result[f'{field}_home'] = safe_int(home_val)
-                else:
-                    result[f'{field}_home'] = safe_int(home_val)
-
+                result[f'{field}_home'] = convert(home_val)
             if away_val is not None:
-                if field == 'possession':
-                    result[f'{field}_away'] = safe_int(away_val)
-                else:
-                    result[f'{field}_away'] = safe_int(away_val)
-
-        # xG is special - use float
-        xg_home = get_stat_value('xg', 'home')
-        xg_away = get_stat_value('xg', 'away')
-        if xg_home is not None:
-            result['xg_home'] = safe_float(xg_home)
-        if xg_away is not None:
-            result['xg_away'] = safe_float(xg_away)
+                result[f'{field}_away'] = convert(away_val)
 
         return result if result else None
 
-    def _update_match_stats(self, match, stats):
-        """Update match with statistics"""
-        for key, value in stats.items():
-            if value is not None and hasattr(match, key):
-                setattr(match, key, value)
-        match.save()
-
-    def _update_match_details(self, match, details):
-        """Update match with additional details (referee, venue, etc.)"""
-        for key, value in details.items():
-            if value is not None and hasattr(match, key):
+    async def _update_match_fields(self, match, values):
+        """Update match with statistics or details (referee, venue, etc.)"""
+        # One targeted UPDATE of the given columns, without a save() round
+        values = {
+            key: value for key, value in values.items()
+            if value is not None and key in MATCH_FIELD_NAMES
+        }
+        if values:
+            await Match.objects.filter(pk=match.pk).aupdate(**values)
+            # Keep the instance in sync for the later import steps
+            for key, value in values.items():
                 setattr(match, key, value)
-        match.save()
 
     async def import_players_with_stats(self, api, competition, tournament_id, season_id,
                                        season, force, dry_run):
@@ -1023,44 +1367,81 @@ class Command(BaseCommand):
 
             total_players = len(players_data)
             self.stdout.write(f"Procesando {total_players} jugadores...")
+            log_progress = self._progress_logger(total_players)
+            # Season stats rows, saved together after the loop
+            stats_rows = []
+            teams_map = await self.get_teams_map(
+                {(p.get('team') or {}).get('id') for p in players_data}
+            )
 
-            for idx, player_data in enumerate(players_data, 1):
+            # All players of the season resolved up front: one lookup and at
+            # most one insert instead of a query per player
+            player_pks = {}
+            created_ids = set()
+            if not dry_run:
+                new_players = {}
+                for p in players_data:
+                    player_info = p.get('player') or {}
+                    team = teams_map.get((p.get('team') or {}).get('id'))
+                    if player_info.get('id') and player_info.get('name') and team:
+                        new_players[player_info['id']] = (player_info['name'], team)
+                player_pks = await self._get_or_create_player_pks(new_players, created_ids)
+
+            # Players are processed several at a time; DB calls of one player
+            # overlap with the others' instead of leaving the loop idle
+            semaphore = asyncio.Semaphore(PLAYER_CONCURRENCY)
+            done = 0
+
+            async def process_player(idx, player_data):
+                nonlocal done
+                player_name = (player_data.get('player') or {}).get('name', 'Unknown')
                 try:
-                    player_name = player_data.get('player', {}).get('name', 'Unknown')
-                    team_name = player_data.get('team', {}).get('name', 'Unknown')
-
-                    # Log cada 50 jugadores o el primero/último
-                    if idx % 50 == 0 or idx == 1 or idx == total_players:
-                        self.stdout.write(
-                            f"      [{idx}/{total_players}] {player_name} ({team_name})"
+                    async with semaphore:
+                        return await self.process_player_with_stats(
+                            player_data, competition, season, teams_map, player_pks,
+                            created_ids, dry_run, force, stats_rows
                         )
-
-                    player_result = await self.process_player_with_stats(
-                        player_data, competition, season, dry_run, force
-                    )
-
-                    if player_result == 'created':
-                        result['players_created'] += 1
-                        result['stats_created'] += 1
-                    elif player_result == 'updated':
-                        result['players_updated'] += 1
-                        result['stats_created'] += 1
-
                 except Exception as e:
-                    player_name = player_data.get('player', {}).get('name', 'Unknown')
                     self.stdout.write(
                         self.style.WARNING(f"[{idx}/{total_players}] ✗ {player_name}: {e}")
                     )
-                    continue
+                    return None
+                finally:
+                    done += 1
+                    team_name = (player_data.get('team') or {}).get('name', 'Unknown')
+                    log_progress(
+                        done, f"      [{done}/{total_players}] {player_name} ({team_name})"
+                    )
+
+            player_results = await asyncio.gather(*(
+                process_player(idx, player_data)
+                for idx, player_data in enumerate(players_data, 1)
+            ), return_exceptions=True)
+
+            for player_result in player_results:
+                if player_result == 'created':
+                    result['players_created'] += 1
+                    result['stats_created'] += 1
+                elif player_result == 'updated':
+                    result['players_updated'] += 1
+                    result['stats_created'] += 1
+
+            if stats_rows:
+                await sync_to_async(self._save_player_stats)(stats_rows)
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"[ERROR] {e}"))
 
         return result
 
-    async def process_player_with_stats(self, player_data, competition, season,
-                                       dry_run, force):
-        """Process player and create stats"""
+    async def process_player_with_stats(self, player_data, competition, season, teams_map,
+                                       player_pks, created_ids, dry_run, force, stats_rows):
+        """
+        Process player and append its unsaved PlayerStats to stats_rows
+
+        player_pks maps SofaScore ids to the pks resolved by the caller;
+        created_ids holds the ids of the players it created.
+        """
         player_info = player_data.get('player', {})
         team_info = player_data.get('team', {})
 
@@ -1072,9 +1453,7 @@ class Command(BaseCommand):
             return 'skipped'
 
         # Find team by GLOBAL api_id
-        team = await sync_to_async(
-            Team.objects.filter(api_id=team_id).first
-        )()
+        team = teams_map.get(team_id)
 
         if not team:
             return 'skipped'
@@ -1082,43 +1461,88 @@ class Command(BaseCommand):
         if dry_run:
             return 'created'
 
-        # Get or create player
-        player, player_created = await self.get_or_create_player(
-            player_name, player_id, team
-        )
+        player_pk = player_pks.get(player_id)
+        player_created = player_id in created_ids
 
-        if not player:
-            return 'skipped'
+        if player_pk is None:
+            # Not resolved up front (no SofaScore id)
+            # Get or create player (seasons run concurrently and share players)
+            async with self.player_lock:
+                player, player_created = await self.get_or_create_player(
+                    player_name, player_id, team
+                )
+            if not player:
+                return 'skipped'
+            player_pk = player.pk
 
-        # Create/update player stats
+        # Create/update player stats (see _save_player_stats)
         stats_data = self.extract_player_stats(player_data)
 
-        await sync_to_async(self._update_or_create_player_stats)(
-            player, team, competition, season, stats_data
-        )
+        stats_rows.append(PlayerStats(
+            player_id=player_pk,
+            team=team,
+            competition=competition,
+            season=season,
+            calculated_at=timezone.now(),
+            **stats_data
+        ))
 
         return 'created' if player_created else 'updated'
 
+    def _save_player_stats(self, rows):
+        """
+        Insert or overwrite season PlayerStats rows, PLAYER_STATS_BATCH_SIZE per statement
+
+        On PostgreSQL the existing rows are locked first with SKIP LOCKED:
+        rows another concurrent import is writing right now are left to it
+        instead of waiting on its locks (both write the same season totals).
+        """
+        unique_rows = {
+            (row.player_id, row.team_id, row.competition_id, row.season): row
+            for row in rows
+        }
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                existing = PlayerStats.objects.filter(
+                    player_id__in={key[0] for key in unique_rows},
+                    competition_id__in={key[2] for key in unique_rows},
+                    season__in={key[3] for key in unique_rows},
+                ).order_by('pk')
+                key_fields = ('player_id', 'team_id', 'competition_id', 'season')
+                locked = set(
+                    existing.select_for_update(skip_locked=True).values_list(*key_fields)
+                )
+                for key in set(existing.values_list(*key_fields)) - locked:
+                    unique_rows.pop(key, None)
+
+            # Same key order in every import, so concurrent upserts can't deadlock
+            PlayerStats.objects.bulk_create(
+                [unique_rows[key] for key in sorted(unique_rows)],
+                batch_size=PLAYER_STATS_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['player', 'team', 'competition', 'season'],
+                update_fields=PLAYER_STATS_UPDATE_FIELDS,
+            )
+
     async def get_or_create_player(self, player_name, player_id, team):
         """Get or create player"""
         if player_id:
-            existing = await sync_to_async(
-                Player.objects.filter(sofascore_id=player_id).first
-            )()
+            existing = await Player.objects.filter(sofascore_id=player_id).afirst()
 
             if existing:
                 return existing, False
 
         # Create new player
-        player = await sync_to_async(self._create_player)(
+        player = await self._create_player(
             player_name, player_id, team
         )
 
         return player, True
 
-    def _create_player(self, name, sofascore_id, team):
-        """Create player"""
-        return Player.objects.create(
+    def _new_player(self, name, sofascore_id, team):
+        """Unsaved Player for a SofaScore player not in the database yet"""
+        return Player(
             name=name,
             short_name=name[:100],
             position='MF',  # Default, will be updated
@@ -1126,39 +1550,20 @@ class Command(BaseCommand):
             sofascore_id=sofascore_id,
         )
 
+    async def _create_player(self, name, sofascore_id, team):
+        """Create player"""
+        player = self._new_player(name, sofascore_id, team)
+        await player.asave(force_insert=True)
+        return player
+
     def extract_player_stats(self, player_data):
         """Extract player statistics"""
+        get = player_data.get
         return {
-            'matches_played': safe_int(player_data.get('appearances', 0)),
-            'minutes_played': safe_int(player_data.get('minutesPlayed', 0)),
-            'goals': safe_int(player_data.get('goals', 0)),
-            'assists': safe_int(player_data.get('assists', 0)),
-            'xg': safe_float(player_data.get('expectedGoals', 0)),
-            'xa': safe_float(player_data.get('expectedAssists', 0)),
-            'shots_total': safe_int(player_data.get('shotsTotal', 0)),
-            'shots_on_target': safe_int(player_data.get('shotsOnTarget', 0)),
-            'passes_completed': safe_int(player_data.get('accuratePass', 0)),
-            'passes_attempted': safe_int(player_data.get('totalPass', 0)),
-            'key_passes': safe_int(player_data.get('keyPass', 0)),
-            'tackles': safe_int(player_data.get('tackles', 0)),
-            'interceptions': safe_int(player_data.get('interceptions', 0)),
-            'yellow_cards': safe_int(player_data.get('yellowCards', 0)),
-            'red_cards': safe_int(player_data.get('redCards', 0)),
+            field: convert(get(key, default))
+            for field, key, convert, default in PLAYER_STAT_FIELDS
         }
 
-    def _update_or_create_player_stats(self, player, team, competition, season, stats_data):
-        """Update or create player stats"""
-        PlayerStats.objects.update_or_create(
-            player=player,
-            team=team,
-            competition=competition,
-            season=season,
-            defaults={
-                **stats_data,
-                'calculated_at': timezone.now()
-            }
-        )
-
     async def import_standings(self, api, competition, tournament_id, season_id,
                               season, force, dry_run):
         """Import team standings/classification"""
@@ -1166,7 +1571,9 @@ class Command(BaseCommand):
 
         try:
             # Get standings data
-            teams_data = await api.get_season_teams(tournament_id, season_id)
+            teams_data = await api.get_season_teams(
+                tournament_id, season_id, cached=season_finished(season)
+            )
 
             if not teams_data or 'standings' not in teams_data:
                 return result
@@ -1184,42 +1591,140 @@ class Command(BaseCommand):
 
         return result
 
-    async def import_match_player_stats(self, match, lineups, force=False):
-        """Import player statistics from match lineups"""
-        if not lineups:
-            return 0
+    async def build_match_player_stats(self, match, lineups):
+        """
+        Build the MatchPlayerStats rows of a match from its lineups
 
-        players_imported = 0
+        Players missing from the database are created; the stats rows are
+        returned unsaved (see _save_match_player_stats).
+        """
+        if not lineups:
+            return []
 
         # SofaScore lineups structure: {'home': {...}, 'away': {...}}
         # or {'confirmed': True, 'home': {...}, 'away': {...}}
-        home_lineup = lineups.get('home', {})
-        away_lineup = lineups.get('away', {})
+        home_players = self._lineup_players(lineups.get('home', {}))
+        away_players = self._lineup_players(lineups.get('away', {}))
 
         # Get teams from match
         home_team = match.home_team
         away_team = match.away_team
 
-        # Process home team players
-        if home_lineup:
-            home_count = await self.process_team_lineup(
-                match, home_team, home_lineup
-            )
-            players_imported += home_count
+        # Players of both lineups: one lookup and at most one insert
+        new_players = {}
+        for team, players_list in ((home_team, home_players), (away_team, away_players)):
+            for player_entry in players_list:
+                player_info = player_entry.get('player', {})
+                if player_info.get('id'):
+                    new_players[player_info['id']] = (player_info.get('name', 'Unknown'), team)
+        player_pks = await self._get_or_create_player_pks(new_players)
 
-        # Process away team players
-        if away_lineup:
-            away_count = await self.process_team_lineup(
-                match, away_team, away_lineup
-            )
-            players_imported += away_count
+        rows = self.process_team_lineup(match, home_team, home_players, player_pks)
+        rows += self.process_team_lineup(match, away_team, away_players, player_pks)
+        return rows
 
-        return players_imported
+    async def _get_or_create_player_pks(self, players, created_ids=None):
+        """
+        Return {sofascore_id: pk} for players given as {sofascore_id: (name, team)}
+
+        Existing players are found with one query (per BULK_BATCH_SIZE ids);
+        the missing ones are created with one bulk insert and, if given,
+        their SofaScore ids are added to created_ids.
+        """
+        if not players:
+            return {}
+
+        # Concurrent imports share players: only one may create them
+        async with self.player_lock:
+            player_pks = await self._player_pks(list(players))
+
+            to_create = [
+                self._new_player(name, sofascore_id, team)
+                for sofascore_id, (name, team) in players.items()
+                if sofascore_id not in player_pks
+            ]
+            if to_create:
+                await Player.objects.abulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+                for player in to_create:
+                    player_pks[player.sofascore_id] = player.pk
+                if created_ids is not None:
+                    created_ids.update(player.sofascore_id for player in to_create)
+
+                # Backends that can't return ids from a bulk insert leave pk unset
+                missing = [p.sofascore_id for p in to_create if p.pk is None]
+                if missing:
+                    player_pks.update(await self._player_pks(missing))
+
+        return player_pks
+
+    async def _player_pks(self, sofascore_ids):
+        """{sofascore_id: pk} of the existing players among sofascore_ids"""
+        player_pks = {}
+        for start in range(0, len(sofascore_ids), BULK_BATCH_SIZE):
+            async for sofascore_id, pk in Player.objects.filter(
+                sofascore_id__in=sofascore_ids[start:start + BULK_BATCH_SIZE]
+            ).values_list('sofascore_id', 'pk'):
+                player_pks[sofascore_id] = pk
+        return player_pks
+
+    def _save_match_player_stats(self, rows):
+        """Insert or overwrite MatchPlayerStats rows, PLAYER_STATS_BATCH_SIZE per statement"""
+        # One row per (match, player): ON CONFLICT can't touch a row twice
+        unique_rows = {(row.match_id, row.player_id): row for row in rows}
+        if connection.vendor in ('postgresql', 'sqlite'):
+            self._raw_upsert_match_player_stats(list(unique_rows.values()))
+            return
+        MatchPlayerStats.objects.bulk_create(
+            unique_rows.values(),
+            batch_size=PLAYER_STATS_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['match', 'player'],
+            update_fields=MATCH_PLAYER_STATS_UPDATE_FIELDS,
+        )
 
-    async def process_team_lineup(self, match, team, lineup_data):
-        """Process lineup for one team"""
-        players_count = 0
+    def _raw_upsert_match_player_stats(self, rows):
+        """
+        Upsert MatchPlayerStats rows with hand-built INSERT ... ON CONFLICT
 
+        Same statement bulk_create(update_conflicts=True) sends, without the
+        ORM query compiler (the hot path of a full season's lineups).
+        Multi-row VALUES rather than executemany: psycopg2 runs executemany
+        as one round-trip per row. PostgreSQL and SQLite only.
+        """
+        quote = connection.ops.quote_name
+        fields = [
+            MatchPlayerStats._meta.get_field(name)
+            for name in ['match', 'player'] + MATCH_PLAYER_STATS_UPDATE_FIELDS
+        ]
+        columns = ', '.join(quote(field.column) for field in fields)
+        updates = ', '.join(
+            f"{quote(field.column)} = EXCLUDED.{quote(field.column)}"
+            for field in fields[2:]
+        )
+        row_sql = '(' + ', '.join(['%s'] * len(fields)) + ')'
+        # SQLite caps the number of query parameters
+        batch_size = min(
+            PLAYER_STATS_BATCH_SIZE, connection.ops.bulk_batch_size(fields, rows)
+        )
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                params = [
+                    field.get_db_prep_save(getattr(row, field.attname), connection)
+                    for row in batch
+                    for field in fields
+                ]
+                cursor.execute(
+                    f"INSERT INTO {quote(MatchPlayerStats._meta.db_table)} ({columns}) "
+                    f"VALUES {', '.join([row_sql] * len(batch))} "
+                    f"ON CONFLICT ({quote(fields[0].column)}, {quote(fields[1].column)}) "
+                    f"DO UPDATE SET {updates}",
+                    params,
+                )
+
+    def _lineup_players(self, lineup_data):
+        """Player entries of a lineup (starters + substitutes) flagged with started/substitute"""
         # Extract players from lineup (starters + substitutes)
         players_list = []
 
@@ -1237,43 +1742,46 @@ class Command(BaseCommand):
                 player_entry['substitute'] = True
                 players_list.append(player_entry)
 
+        return players_list
+
+    def process_team_lineup(self, match, team, players_list, player_pks):
+        """Build the unsaved MatchPlayerStats rows of one team's lineup players"""
+        rows = []
+
         # Process each player
         for player_entry in players_list:
             try:
                 player_info = player_entry.get('player', {})
-                player_id = player_info.get('id')
+                player_pk = player_pks.get(player_info.get('id'))
 
-                if not player_id:
+                if player_pk is None:
                     continue
 
-                # Find player by sofascore_id
-                player = await sync_to_async(
-                    Player.objects.filter(sofascore_id=player_id).first
-                )()
-
-                # If player doesn't exist, create it
-                if not player:
-                    player_name = player_info.get('name', 'Unknown')
-                    player = await sync_to_async(self._create_player)(
-                        player_name, player_id, team
-                    )
-
                 # Extract statistics
                 stats_data = self.extract_player_match_stats(player_entry, team)
 
-                # Save match player stats
-                await sync_to_async(self._create_or_update_match_player_stats)(
-                    match, player, team, stats_data
-                )
-
-                players_count += 1
+                rows.append(MatchPlayerStats(
+                    match=match,
+                    player_id=player_pk,
+                    team=team,
+                    **stats_data
+                ))
 
             except Exception as e:
                 # Log error but continue with other players
                 player_name = player_entry.get('player', {}).get('name', 'Unknown')
+                self.stdout.write(
+                    self.style.WARNING(f"  ✗ {player_name} ({team.name}): {e}")
+                )
                 continue
 
-        return players_count
+        return rows
+
+    async def _player_pk(self, sofascore_id):
+        """Primary key of the player with this SofaScore id, or None"""
+        return await Player.objects.filter(
+            sofascore_id=sofascore_id
+        ).values_list('pk', flat=True).afirst()
 
     def extract_player_match_stats(self, player_entry, team):
         """Extract player match statistics from lineup data"""
@@ -1287,109 +1795,46 @@ class Command(BaseCommand):
         shirt_number = player_info.get('shirtNumber')
 
         # Extract statistics
+        get = statistics.get
         stats = {
             'started': started,
             'substitute': substitute,
             'position': position,
             'shirt_number': safe_int(shirt_number),
-            'minutes_played': safe_int(statistics.get('minutesPlayed', 0)),
-            'rating': safe_float(statistics.get('rating')),
-
-            # Goals & assists
-            'goals': safe_int(statistics.get('goals', 0)),
-            'assists': safe_int(statistics.get('goalAssist', 0)),
-            'xg': safe_float(statistics.get('expectedGoals')),
-            'xa': safe_float(statistics.get('expectedAssists')),
-
-            # Shots
-            'shots': safe_int(statistics.get('totalShots', 0)),
-            'shots_on_target': safe_int(statistics.get('shotsOnTarget', 0)),
-            'shots_off_target': safe_int(statistics.get('shotsOffTarget', 0)),
-            'shots_blocked': safe_int(statistics.get('blockedShots', 0)),
-            'big_chances_missed': safe_int(statistics.get('bigChanceMissed', 0)),
-
-            # Passes
-            'passes_completed': safe_int(statistics.get('accuratePass', 0)),
-            'passes_attempted': safe_int(statistics.get('totalPass', 0)),
-            'key_passes': safe_int(statistics.get('keyPass', 0)),
-            'accurate_crosses': safe_int(statistics.get('accurateCross', 0)),
-            'total_crosses': safe_int(statistics.get('totalCross', 0)),
-            'big_chances_created': safe_int(statistics.get('bigChanceCreated', 0)),
-
-            # Defensive
-            'tackles': safe_int(statistics.get('totalTackle', 0)),
-            'tackles_won': safe_int(statistics.get('wonTackle', 0)),
-            'interceptions': safe_int(statistics.get('interceptions', 0)),
-            'clearances': safe_int(statistics.get('clearances', 0)),
-            'blocked_shots': safe_int(statistics.get('blockedShots', 0)),
-
-            # Duels
-            'duels_won': safe_int(statistics.get('duelWon', 0)),
-            'duels_lost': safe_int(statistics.get('duelLost', 0)),
-            'aerials_won': safe_int(statistics.get('aerialWon', 0)),
-            'aerials_lost': safe_int(statistics.get('aerialLost', 0)),
-            'dribbles_successful': safe_int(statistics.get('successfulDribbles', 0)),
-            'dribbles_attempted': safe_int(statistics.get('totalDribbles', 0)),
-            'was_fouled': safe_int(statistics.get('wasFouled', 0)),
-
-            # Discipline
-            'fouls_committed': safe_int(statistics.get('fouls', 0)),
-            'yellow_card': safe_int(statistics.get('yellowCards', 0)) > 0,
-            'red_card': safe_int(statistics.get('redCards', 0)) > 0,
-
-            # Other
-            'touches': safe_int(statistics.get('touches', 0)),
-            'dispossessed': safe_int(statistics.get('dispossessed', 0)),
-            'offsides': safe_int(statistics.get('offsides', 0)),
+            'yellow_card': safe_int(get('yellowCards', 0)) > 0,
+            'red_card': safe_int(get('redCards', 0)) > 0,
         }
-
-        # Goalkeeper stats (if position is GK)
-        if position == 'G':
-            stats['saves'] = safe_int(statistics.get('saves', 0))
-            stats['saves_inside_box'] = safe_int(statistics.get('savesInsideBox', 0))
-            stats['punches'] = safe_int(statistics.get('punches', 0))
-            stats['runs_out'] = safe_int(statistics.get('goodHighClaim', 0))
-            stats['successful_runs_out'] = safe_int(statistics.get('successfulRunsOut', 0))
-            stats['high_claims'] = safe_int(statistics.get('highClaims', 0))
+        # Goalkeepers (position G) also get the GK-only stats
+        fields = PLAYER_MATCH_GK_STAT_FIELDS if position == 'G' else PLAYER_MATCH_STAT_FIELDS
+        for field, key, convert, default in fields:
+            stats[field] = convert(get(key, default))
 
         return stats
 
-    def _create_or_update_match_player_stats(self, match, player, team, stats_data):
-        """Create or update match player statistics"""
-        MatchPlayerStats.objects.update_or_create(
-            match=match,
-            player=player,
-            defaults={
-                'team': team,
-                **stats_data
-            }
-        )
-
     async def import_match_incidents(self, api, match, event_id):
         """Import match incidents (goals, cards, substitutions, VAR)"""
         try:
             incidents_data = await api.get_partido_incidentes(event_id)
+        except FETCH_ERRORS:
+            return 0  # Continue if incidents fetch fails
 
-            if not incidents_data or 'incidents' not in incidents_data:
-                return 0
+        if not incidents_data or 'incidents' not in incidents_data:
+            return 0
 
-            incidents_list = incidents_data.get('incidents', [])
-            incidents_created = 0
+        incidents_list = incidents_data.get('incidents', [])
+        incidents_created = 0
 
-            for incident_data in incidents_list:
-                try:
-                    incident_created = await self.process_match_incident(
-                        match, incident_data
-                    )
-                    if incident_created:
-                        incidents_created += 1
-                except Exception:
-                    continue  # Skip problematic incidents
-
-            return incidents_created
+        for incident_data in incidents_list:
+            try:
+                incident_created = await self.process_match_incident(
+                    match, incident_data
+                )
+                if incident_created:
+                    incidents_created += 1
+            except Exception:
+                continue  # Skip problematic incidents
 
-        except Exception:
-            return 0
+        return incidents_created
 
     async def process_match_incident(self, match, incident_data):
         """Process and save a single match incident"""
@@ -1421,34 +1866,30 @@ class Command(BaseCommand):
         team_data = incident_data.get('team', {})
         team_id = team_data.get('id')
 
-        # Find team
-        team = await sync_to_async(
-            Team.objects.filter(api_id=team_id).first
-        )()
+        # Find team (the match's teams are already in the shared map)
+        team = (await self.get_teams_map([team_id])).get(team_id) if team_id else None
+
+        # Players are only referenced by FK: look up their pks, not full rows
 
         # Extract player info
-        player = None
+        player_pk = None
         player_data = incident_data.get('player', {})
         if player_data:
             player_id = player_data.get('id')
             if player_id:
-                player = await sync_to_async(
-                    Player.objects.filter(sofascore_id=player_id).first
-                )()
+                player_pk = await self._player_pk(player_id)
 
         # Extract assist player (for goals)
-        assist_player = None
+        assist_player_pk = None
         if 'assist1' in incident_data:
             assist_data = incident_data.get('assist1', {})
             assist_id = assist_data.get('id')
             if assist_id:
-                assist_player = await sync_to_async(
-                    Player.objects.filter(sofascore_id=assist_id).first
-                )()
+                assist_player_pk = await self._player_pk(assist_id)
 
         # Extract substitution players
-        player_in = None
-        player_out = None
+        player_in_pk = None
+        player_out_pk = None
         if mapped_type == 'substitution':
             # For substitutions, playerOut and playerIn are separate fields
             # (not using the main 'player' field)
@@ -1458,18 +1899,14 @@ class Command(BaseCommand):
             if player_out_data:
                 player_out_id = player_out_data.get('id')
                 if player_out_id:
-                    player_out = await sync_to_async(
-                        Player.objects.filter(sofascore_id=player_out_id).first
-                    )()
+                    player_out_pk = await self._player_pk(player_out_id)
 
             # player_in from playerIn field
             player_in_data = incident_data.get('playerIn', {})
             if player_in_data:
                 player_in_id = player_in_data.get('id')
                 if player_in_id:
-                    player_in = await sync_to_async(
-                        Player.objects.filter(sofascore_id=player_in_id).first
-                    )()
+                    player_in_pk = await self._player_pk(player_in_id)
 
         # Extract score after incident (for goals)
         score_home = None
@@ -1479,26 +1916,26 @@ class Command(BaseCommand):
             score_away = safe_int(incident_data.get('awayScore'))
 
         # Create or update incident
-        incident_obj = await sync_to_async(self._create_match_incident)(
+        incident_obj = await self._create_match_incident(
             match=match,
             team=team,
-            player=player,
+            player_id=player_pk,
             incident_type=mapped_type,
             time=time,
             time_added=time_added,
             score_home=score_home,
             score_away=score_away,
-            assist_player=assist_player,
-            player_in=player_in,
-            player_out=player_out,
+            assist_player_id=assist_player_pk,
+            player_in_id=player_in_pk,
+            player_out_id=player_out_pk,
         )
 
         return incident_obj is not None
 
-    def _create_match_incident(self, match, team, player, incident_type, time,
-                                time_added, score_home, score_away, assist_player,
-                                player_in, player_out):
-        """Create or update match incident (avoids duplicates)"""
+    async def _create_match_incident(self, match, team, player_id, incident_type, time,
+                                time_added, score_home, score_away, assist_player_id,
+                                player_in_id, player_out_id):
+        """Create or update match incident (avoids duplicates); players are given by pk"""
         try:
             # Build lookup criteria to identify unique incidents
             # An incident is unique by: match + type + time + time_added + player
@@ -1511,25 +1948,25 @@ class Command(BaseCommand):
             # Add optional fields to lookup if they exist
             if time_added is not None:
                 lookup['time_added'] = time_added
-            if player is not None:
-                lookup['player'] = player
+            if player_id is not None:
+                lookup['player_id'] = player_id
 
             # For substitutions, also check player_in/player_out to avoid duplicates
-            if incident_type == 'substitution' and player_out is not None:
-                lookup['player_out'] = player_out
+            if incident_type == 'substitution' and player_out_id is not None:
+                lookup['player_out_id'] = player_out_id
 
             # Build defaults (data to update if incident exists)
             defaults = {
                 'team': team,
                 'score_home': score_home,
                 'score_away': score_away,
-                'assist_player': assist_player,
-                'player_in': player_in,
-                'player_out': player_out,
+                'assist_player_id': assist_player_id,
+                'player_in_id': player_in_id,
+                'player_out_id': player_out_id,
             }
 
             # Use update_or_create to avoid duplicates
-            incident, created = MatchIncident.objects.update_or_create(
+            incident, created = await MatchIncident.objects.aupdate_or_create(
                 **lookup,
                 defaults=defaults
             )
@@ -1575,13 +2012,11 @@ class Command(BaseCommand):
             return False
 
         # Find player by sofascore_id
-        player = await sync_to_async(
-            Player.objects.filter(sofascore_id=player_id).first
-        )()
+        player = await Player.objects.filter(sofascore_id=player_id).afirst()
 
         # If player doesn't exist, create basic player record
         if not player:
-            player = await sync_to_async(self._create_player)(
+            player = await self._create_player(
                 player_name, player_id, team
             )
 
@@ -1618,7 +2053,7 @@ class Command(BaseCommand):
                 severity = 'Severe'
 
         # Create or update injury
-        injury_obj = await sync_to_async(self._create_or_update_injury)(
+        injury_obj = await self._create_or_update_injury(
             player=player,
             team=team,
             injury_type=injury_type,
@@ -1629,28 +2064,30 @@ class Command(BaseCommand):
 
         return injury_obj is not None
 
-    def _create_or_update_injury(self, player, team, injury_type, status,
+    async def _create_or_update_injury(self, player, team, injury_type, status,
                                   expected_return_date, severity):
         """Create or update player injury record"""
         try:
             # Check if there's an active injury for this player
-            active_injury = Injury.objects.filter(
+            active_injury = await Injury.objects.filter(
                 player=player,
                 status__in=['injured', 'doubtful', 'recovering']
-            ).first()
+            ).afirst()
 
             if active_injury:
-                # Update existing injury
+                # Update existing injury (only the columns set here)
+                update_fields = ['status', 'expected_return_date', 'severity', 'updated_at']
                 if injury_type:
                     active_injury.injury_type = injury_type
+                    update_fields.append('injury_type')
                 active_injury.status = status
                 active_injury.expected_return_date = expected_return_date
                 active_injury.severity = severity
-                active_injury.save()
+                await active_injury.asave(update_fields=update_fields)
                 return active_injury
             else:
                 # Create new injury
-                injury = Injury.objects.create(
+                injury = await Injury.objects.acreate(
                     player=player,
                     team=team,
                     injury_type=injury_type or 'Unknown',
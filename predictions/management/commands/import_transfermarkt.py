@@ -28,7 +28,30 @@ from django.db import transaction
 from django.utils import timezone
 from predictions.models import Competition, Team, TeamMarketValue, Player
 from predictions.scrapers.transfermarkt_scraper import TransfermarktScraper
-from predictions.scrapers.utils import fuzzy_match_team, fuzzy_match_player
+from predictions.scrapers.utils import (
+    fuzzy_match_team, fuzzy_match_prepared, prepare_fuzzy_choices,
+    build_team_index, team_index_key, build_player_index, player_index_key,
+)
+
+
+# TeamMarketValue fields overwritten on re-import
+MARKET_VALUE_UPDATE_FIELDS = [
+    'total_market_value_eur', 'avg_player_value_eur', 'squad_size', 'avg_age',
+    'foreigners_count', 'scraped_at',
+]
+# ...and, when transfer data was scraped, the transfer activity
+TRANSFER_UPDATE_FIELDS = [
+    'transfer_income_eur', 'transfer_expenditure_eur', 'net_transfer_eur',
+]
+
+# Player fields written from the squad values
+PLAYER_VALUE_UPDATE_FIELDS = ['market_value_eur', 'transfermarkt_id', 'updated_at']
+
+BULK_BATCH_SIZE = 500
+
+# Valuations saved every N teams, so a DB error or a crash late in the
+# (slow) scraping loop doesn't lose the teams already scraped
+MARKET_VALUE_FLUSH_SIZE = 5
 
 
 class Command(BaseCommand):
@@ -94,31 +117,43 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("[FORCE] Sobreescribira datos existentes"))
         self.stdout.write("")
 
-        # Initialize scraper
-        scraper = TransfermarktScraper()
-
         # Counters
         total_teams_processed = 0
         total_values_created = 0
         total_values_updated = 0
         total_players_updated = 0
 
-        # Process each competition and season
-        for comp_code in competitions:
-            for season in seasons:
-                self.stdout.write(f"\n{comp_code} - Temporada {season}/{season + 1}")
-                self.stdout.write("=" * 80)
+        # Competitions looked up once, not once per season
+        competitions_by_code = {
+            competition.code: competition
+            for competition in Competition.objects.filter(code__in=competitions)
+        }
 
-                result = self.import_season(
-                    scraper, comp_code, season, import_type,
-                    update_player_values, force, dry_run
-                )
+        # Initialize scraper (one pooled connection for the whole import)
+        with TransfermarktScraper() as scraper:
+            # Process each competition and season
+            for comp_code in competitions:
+                for season in seasons:
+                    self.stdout.write(f"\n{comp_code} - Temporada {season}/{season + 1}")
+                    self.stdout.write("=" * 80)
+
+                    try:
+                        result = self.import_season(
+                            scraper, comp_code, competitions_by_code.get(comp_code),
+                            season, import_type,
+                            update_player_values, force, dry_run
+                        )
+                    except Exception as e:
+                        self.stdout.write(
+                            self.style.ERROR(f"  [ERROR] {comp_code} {season}: {e}")
+                        )
+                        continue
 
-                if result:
-                    total_teams_processed += result.get('teams_processed', 0)
-                    total_values_created += result.get('values_created', 0)
-                    total_values_updated += result.get('values_updated', 0)
-                    total_players_updated += result.get('players_updated', 0)
+                    if result:
+                        total_teams_processed += result.get('teams_processed', 0)
+                        total_values_created += result.get('values_created', 0)
+                        total_values_updated += result.get('values_updated', 0)
+                        total_players_updated += result.get('players_updated', 0)
 
         # Summary
         self.stdout.write("\n" + "=" * 80)
@@ -131,14 +166,11 @@ class Command(BaseCommand):
             self.stdout.write(f"Jugadores actualizados: {total_players_updated}")
         self.stdout.write("=" * 80)
 
-    def import_season(self, scraper, comp_code, season, import_type,
+    def import_season(self, scraper, comp_code, competition, season, import_type,
                       update_player_values, force, dry_run):
-        """Import market values for one competition/season"""
+        """Import market values for one competition/season (competition is None if not found)"""
 
-        try:
-            # Get competition
-            competition = Competition.objects.get(code=comp_code)
-        except Competition.DoesNotExist:
+        if competition is None:
             self.stdout.write(self.style.ERROR(f"  [ERROR] Competición {comp_code} no encontrada"))
             return None
 
@@ -160,24 +192,33 @@ class Command(BaseCommand):
 
         self.stdout.write(f"  [OK] {len(teams_data)} equipos encontrados")
 
-        # Get existing teams for fuzzy matching
-        existing_teams = Team.objects.filter(competition=competition)
+        # Get existing teams for matching (evaluated once, indexed by normalized name)
+        existing_teams = list(Team.objects.filter(competition=competition))
+        team_index = build_team_index(existing_teams)
+
+        # Teams that already have a valuation for this season (one query)
+        valued_team_ids = set(
+            TeamMarketValue.objects.filter(
+                competition=competition, season=season
+            ).values_list('team_id', flat=True)
+        )
+
+        # Team results with a valuation, saved in chunks (see flush_market_values)
+        pending = []
 
         # Process each team
         for team_data in teams_data:
             try:
                 team_result = self.process_team_market_value(
-                    team_data, competition, season, existing_teams,
-                    scraper, import_type, update_player_values, force, dry_run
+                    team_data, competition, season, existing_teams, team_index,
+                    valued_team_ids, scraper, import_type, update_player_values,
+                    force, dry_run
                 )
 
-                result['teams_processed'] += 1
-
-                if team_result.get('created'):
-                    result['values_created'] += 1
-                elif team_result.get('updated'):
-                    result['values_updated'] += 1
+                if team_result.get('market_value'):
+                    pending.append(team_result)
 
+                result['teams_processed'] += 1
                 result['players_updated'] += team_result.get('players_updated', 0)
 
             except Exception as e:
@@ -187,6 +228,13 @@ class Command(BaseCommand):
                 )
                 continue
 
+            if len(pending) >= MARKET_VALUE_FLUSH_SIZE:
+                self.flush_market_values(pending, result)
+                pending = []
+
+        if pending:
+            self.flush_market_values(pending, result)
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"  [OK] {result['values_created']} creados, "
@@ -197,19 +245,25 @@ class Command(BaseCommand):
         return result
 
     def process_team_market_value(self, team_data, competition, season, existing_teams,
-                                   scraper, import_type, update_player_values, force, dry_run):
+                                   team_index, valued_team_ids, scraper, import_type,
+                                   update_player_values, force, dry_run):
         """
         Process a single team's market value data
 
+        The TeamMarketValue is built unsaved (see save_market_values).
+
         Returns:
-            Dict with 'created', 'updated', 'players_updated'
+            Dict with 'created', 'updated', 'players_updated' and 'market_value'
         """
-        result = {'created': False, 'updated': False, 'players_updated': 0}
+        result = {'created': False, 'updated': False, 'players_updated': 0,
+                  'market_value': None}
 
         team_name = team_data.get('team_name', '')
 
-        # Fuzzy match team
-        team, score = fuzzy_match_team(team_name, existing_teams, threshold=75)
+        # Exact match on normalized name, fuzzy match only on misses
+        team, score = team_index.get(team_index_key(team_name)), 100
+        if not team:
+            team, score = fuzzy_match_team(team_name, existing_teams, threshold=75)
 
         if not team:
             self.stdout.write(
@@ -223,65 +277,97 @@ class Command(BaseCommand):
             )
 
         # Check if TeamMarketValue already exists
-        existing_value = TeamMarketValue.objects.filter(
-            team=team,
-            competition=competition,
-            season=season
-        ).first()
+        exists = team.pk in valued_team_ids
 
-        if existing_value and not force:
+        if exists and not force:
             return result
 
-        # Extract data
-        total_value = team_data.get('total_market_value_eur', 0)
-        avg_value = team_data.get('avg_player_value_eur', 0)
-        squad_size = team_data.get('squad_size', 0)
-        avg_age = team_data.get('avg_age', 0)
-        foreigners = team_data.get('foreigners_count', 0)
-
         if not dry_run:
-            with transaction.atomic():
-                # Create or update TeamMarketValue
-                market_value, created = TeamMarketValue.objects.update_or_create(
-                    team=team,
-                    competition=competition,
-                    season=season,
-                    defaults={
-                        'total_market_value_eur': total_value,
-                        'avg_player_value_eur': avg_value,
-                        'squad_size': squad_size,
-                        'avg_age': avg_age,
-                        'foreigners_count': foreigners,
-                        'scraped_at': timezone.now(),
-                    }
-                )
-
-                result['created'] = created
-                result['updated'] = not created
-
-                # Get transfer data if requested
-                if import_type in ['transfers', 'all']:
-                    team_id = team_data.get('team_id')
-                    if team_id:
-                        transfer_data = scraper.get_team_transfers(team_id, season)
-
-                        if transfer_data:
-                            market_value.transfer_income_eur = transfer_data.get('transfer_income_eur', 0)
-                            market_value.transfer_expenditure_eur = transfer_data.get('transfer_expenditure_eur', 0)
-                            market_value.net_transfer_eur = transfer_data.get('net_transfer_eur', 0)
-                            market_value.save()
-
-                # Update individual player values if requested
-                if update_player_values:
-                    team_id = team_data.get('team_id')
-                    if team_id:
-                        players_updated = self.update_player_values(
-                            scraper, team_id, team, season, dry_run
-                        )
-                        result['players_updated'] = players_updated
+            market_value = TeamMarketValue(
+                team=team,
+                competition=competition,
+                season=season,
+                total_market_value_eur=team_data.get('total_market_value_eur', 0),
+                avg_player_value_eur=team_data.get('avg_player_value_eur', 0),
+                squad_size=team_data.get('squad_size', 0),
+                avg_age=team_data.get('avg_age', 0),
+                foreigners_count=team_data.get('foreigners_count', 0),
+                scraped_at=timezone.now(),
+            )
+            result['market_value'] = market_value
+            result['created'] = not exists
+            result['updated'] = exists
+
+            # Get transfer data if requested
+            if import_type in ['transfers', 'all']:
+                team_id = team_data.get('team_id')
+                if team_id:
+                    transfer_data = scraper.get_team_transfers(team_id, season)
+
+                    if transfer_data:
+                        market_value.transfer_income_eur = transfer_data.get('transfer_income_eur', 0)
+                        market_value.transfer_expenditure_eur = transfer_data.get('transfer_expenditure_eur', 0)
+                        market_value.net_transfer_eur = transfer_data.get('net_transfer_eur', 0)
+
+            # Update individual player values if requested
+            if update_player_values:
+                team_id = team_data.get('team_id')
+                if team_id:
+                    players_updated = self.update_player_values(
+                        scraper, team_id, team, season, dry_run
+                    )
+                    result['players_updated'] = players_updated
 
         return result
 
+    def flush_market_values(self, team_results, result):
+        """
+        Save a chunk of valuations and count them as created/updated
+
+        A DB error is reported and the import goes on with the next chunk;
+        the failed teams are not counted.
+        """
+        try:
+            self.save_market_values([tr['market_value'] for tr in team_results])
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"  [ERROR] Guardando {len(team_results)} valuaciones: {e}")
+            )
+            return
+
+        for team_result in team_results:
+            if team_result.get('created'):
+                result['values_created'] += 1
+            elif team_result.get('updated'):
+                result['values_updated'] += 1
+
+    def save_market_values(self, market_values):
+        """
+        Insert or overwrite TeamMarketValue rows in one transaction
+
+        Rows with transfer data also overwrite the transfer fields; the others
+        keep the transfer activity already stored.
+        """
+        # One row per team: ON CONFLICT can't touch a row twice
+        market_values = list({mv.team_id: mv for mv in market_values}.values())
+
+        # Transfer fields stay None when no transfer data was scraped
+        with_transfers = [mv for mv in market_values if mv.transfer_income_eur is not None]
+        without_transfers = [mv for mv in market_values if mv.transfer_income_eur is None]
+
+        with transaction.atomic():
+            for rows, update_fields in (
+                (without_transfers, MARKET_VALUE_UPDATE_FIELDS),
+                (with_transfers, MARKET_VALUE_UPDATE_FIELDS + TRANSFER_UPDATE_FIELDS),
+            ):
+                if rows:
+                    TeamMarketValue.objects.bulk_create(
+                        rows,
+                        update_conflicts=True,
+                        unique_fields=['team', 'competition', 'season'],
+                        update_fields=update_fields,
+                    )
+
     def update_player_values(self, scraper, team_id, team, season, dry_run):
         """
         Update individual player market values
@@ -301,8 +387,15 @@ class Command(BaseCommand):
         if not players_data:
             return 0
 
-        updated_count = 0
-        existing_players = Player.objects.filter(team=team)
+        # Matched players by pk (a player matched twice is written once)
+        to_update = {}
+        # Only the columns matching and the update need, not full Player rows
+        existing_players = list(
+            Player.objects.filter(team=team).only('id', 'name', 'short_name', 'transfermarkt_id')
+        )
+        player_index = build_player_index(existing_players)
+        # Squad names preprocessed once for all the fuzzy fallbacks
+        player_choices = prepare_fuzzy_choices(existing_players)
 
         for player_data in players_data:
             player_name = player_data.get('player_name', '')
@@ -311,8 +404,11 @@ class Command(BaseCommand):
             if not player_name or market_value == 0:
                 continue
 
-            # Fuzzy match player
-            player, score = fuzzy_match_player(player_name, existing_players, threshold=85)
+            # Exact match on name/short_name, fuzzy match only on misses
+            player = player_index.get(player_index_key(player_name))
+            if not player:
+                # (overrides and short_name hits are already in the index)
+                player, score = fuzzy_match_prepared(player_name, player_choices, threshold=85)
 
             if player and not dry_run:
                 # Update market value
@@ -323,7 +419,14 @@ class Command(BaseCommand):
                 if player_id and not player.transfermarkt_id:
                     player.transfermarkt_id = int(player_id)
 
-                player.save()
-                updated_count += 1
+                # bulk_update doesn't refresh auto_now fields
+                player.updated_at = timezone.now()
+                to_update[player.pk] = player
+
+        # One UPDATE batch for the whole squad
+        if to_update:
+            Player.objects.bulk_update(
+                to_update.values(), PLAYER_VALUE_UPDATE_FIELDS, batch_size=BULK_BATCH_SIZE
+            )
 
-        return updated_count
+        return len(to_update)
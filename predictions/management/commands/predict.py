@@ -7,11 +7,18 @@ Uso:
 """
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from predictions.models import Match, Prediction, Competition
 from django.utils import timezone
 from datetime import timedelta
 
 
+# Campos de Prediction que se sobrescriben al volver a predecir un partido
+PREDICTION_FIELDS = [
+    'prob_home', 'prob_draw', 'prob_away', 'prob_over_25', 'prob_btts', 'predicted_corners',
+]
+
+
 class Command(BaseCommand):
     help = 'Genera predicciones para partidos próximos usando ML, Poisson o Ensemble'
 
@@ -68,16 +75,17 @@ class Command(BaseCommand):
         start_date = timezone.now()
         end_date = start_date + timedelta(days=days)
 
-        upcoming_matches = Match.objects.filter(
+        # Competición y equipos en la misma consulta (se muestran por partido)
+        upcoming_matches = list(Match.objects.filter(
             competition__code__in=competitions,
             utc_date__gte=start_date,
             utc_date__lte=end_date,
             status__in=['SCHEDULED', 'TIMED']  # Incluir TIMED (partidos con hora confirmada)
-        ).order_by('utc_date')
+        ).select_related('competition', 'home_team', 'away_team').order_by('utc_date'))
 
-        self.stdout.write(f"Partidos encontrados: {upcoming_matches.count()}")
+        self.stdout.write(f"Partidos encontrados: {len(upcoming_matches)}")
 
-        if upcoming_matches.count() == 0:
+        if not upcoming_matches:
             self.stdout.write(self.style.WARNING('No hay partidos próximos'))
             return
 
@@ -117,22 +125,28 @@ class Command(BaseCommand):
 
             self.stdout.write("")
 
-            # Generar predicciones
+            # Generar predicciones de todos los partidos en un solo lote
+            # (cada modelo se evalúa una vez sobre la matriz de features)
+            batch_predictions = predictor.predict_matches_batch(upcoming_matches, skip_errors=True)
+
             predictions_created = 0
             value_bets_found = 0
 
-            for match in upcoming_matches:
+            # Predicciones ya guardadas de estos partidos (una consulta); las
+            # nuevas y las actualizadas se escriben juntas al final
+            existing_predictions = {
+                p.match_id: p for p in Prediction.objects.filter(match__in=upcoming_matches)
+            }
+            to_create = []
+            to_update = []
+
+            for match, predictions in zip(upcoming_matches, batch_predictions):
                 try:
-                    # Hacer predicción según el método
+                    if predictions is None:
+                        raise ValueError('features no disponibles')
+
+                    # Adaptar la predicción según el método
                     if method == 'ml':
-                        # ML usa parámetros separados
-                        predictions = predictor.predict_match(
-                            home_team_id=match.home_team_id,
-                            away_team_id=match.away_team_id,
-                            match_date=match.utc_date,
-                            competition_id=match.competition_id,
-                            season=match.season
-                        )
                         # Adaptar formato para guardar en BD
                         prob_home = predictions['result']['home_win']
                         prob_draw = predictions['result']['draw']
@@ -146,8 +160,6 @@ class Command(BaseCommand):
                         lambda_away = None
 
                     elif method == 'ensemble':
-                        # Ensemble usa el objeto Match directamente
-                        predictions = predictor.predict_match(match)
                         prob_home = predictions['prob_home']
                         prob_draw = predictions['prob_draw']
                         prob_away = predictions['prob_away']
@@ -167,23 +179,24 @@ class Command(BaseCommand):
                         else:
                             most_likely = 'away_win'
 
-                    # Guardar en base de datos
-                    from predictions.models import Prediction
-
-                    prediction_obj, created = Prediction.objects.update_or_create(
-                        match=match,
-                        defaults={
-                            'prob_home': prob_home,
-                            'prob_draw': prob_draw,
-                            'prob_away': prob_away,
-                            'prob_over_25': prob_over_25,
-                            'prob_btts': prob_btts,
-                            'predicted_corners': predicted_corners,
-                        }
-                    )
-
-                    if created:
+                    # Guardar en base de datos (ver bulk_create/bulk_update tras el bucle)
+                    values = {
+                        'prob_home': prob_home,
+                        'prob_draw': prob_draw,
+                        'prob_away': prob_away,
+                        'prob_over_25': prob_over_25,
+                        'prob_btts': prob_btts,
+                        'predicted_corners': predicted_corners,
+                    }
+
+                    prediction_obj = existing_predictions.get(match.id)
+                    if prediction_obj is None:
+                        to_create.append(Prediction(match=match, **values))
                         predictions_created += 1
+                    else:
+                        for field, value in values.items():
+                            setattr(prediction_obj, field, value)
+                        to_update.append(prediction_obj)
 
                     # Mostrar predicción
                     self.stdout.write(
@@ -211,7 +224,7 @@ class Command(BaseCommand):
                     # Buscar value bets si está activado
                     if find_value and method == 'ensemble':
                         try:
-                            value_bets = value_detector.find_value_bets(match)
+                            value_bets = value_detector.find_value_bets(match, predictions)
                             if value_bets:
                                 value_bets_found += len(value_bets)
                                 self.stdout.write(self.style.SUCCESS(
@@ -234,6 +247,11 @@ class Command(BaseCommand):
                     traceback.print_exc()
                     continue
 
+            # Todas las predicciones en una sola transacción
+            with transaction.atomic():
+                Prediction.objects.bulk_create(to_create, batch_size=500)
+                Prediction.objects.bulk_update(to_update, PREDICTION_FIELDS, batch_size=500)
+
             self.stdout.write("")
             self.stdout.write("="*70)
             self.stdout.write(self.style.SUCCESS(f'Total predicciones generadas: {predictions_created}'))
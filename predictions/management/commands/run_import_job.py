@@ -80,6 +80,24 @@ class Command(BaseCommand):
             self.stderr.write(f"Job {job_id} not found")
             return
 
+        modes = [
+            mode for mode, enabled in (
+                ('teams', job.import_teams),
+                ('matches', job.import_matches),
+                ('players', job.import_players),
+                ('standings', job.import_standings),
+            ) if enabled
+        ]
+
+        # Without --mode the import runs every phase: a job with none checked fails instead
+        if not modes:
+            job.status = 'failed'
+            job.completed_at = timezone.now()
+            job.error_message = 'No import phases selected'
+            job.save()
+            job.append_log('[ERROR] No import phases selected')
+            return
+
         # Update status to running
         job.status = 'running'
         job.started_at = timezone.now()
@@ -94,20 +112,9 @@ class Command(BaseCommand):
                 '--competitions', job.competitions,
                 '--seasons', job.seasons,
                 '--job-id', str(job_id),  # Pass job_id for progress tracking
+                '--mode', *modes,
             ]
 
-            if job.import_teams and job.import_matches and job.import_players and job.import_standings:
-                cmd_args.append('--all-data')
-            else:
-                if job.import_teams:
-                    cmd_args.append('--teams-only')
-                if job.import_matches:
-                    cmd_args.append('--matches-only')
-                if job.import_players:
-                    cmd_args.append('--players-only')
-                if job.import_standings:
-                    cmd_args.append('--standings-only')
-
             if job.force:
                 cmd_args.append('--force')
             if job.dry_run:
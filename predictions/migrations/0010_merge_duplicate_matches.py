@@ -0,0 +1,82 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def merge_duplicate_matches(apps, schema_editor):
+    """
+    Fusionar partidos duplicados antes de crear la restricción única
+
+    Se conserva el que tiene api_id (o el más antiguo) y se le reasignan
+    predicciones, tiros, incidencias y estadísticas de jugadores. Las columnas
+    que el conservado tiene a NULL (marcador, estadísticas, xG...) se rellenan
+    con el valor del duplicado, y si el duplicado ya está FINISHED se copia
+    también el estado.
+    """
+    Match = apps.get_model('predictions', 'Match')
+    Prediction = apps.get_model('predictions', 'Prediction')
+    ShotEvent = apps.get_model('predictions', 'ShotEvent')
+    MatchIncident = apps.get_model('predictions', 'MatchIncident')
+    MatchPlayerStats = apps.get_model('predictions', 'MatchPlayerStats')
+
+    key_fields = ['competition_id', 'season', 'home_team_id', 'away_team_id', 'utc_date']
+    # Columnas rellenables desde el duplicado (del modelo histórico)
+    merge_fields = [
+        f.attname for f in Match._meta.concrete_fields
+        if f.null and f.attname not in key_fields and f.attname != 'api_id'
+    ]
+    groups = list(
+        Match.objects.values(*key_fields)
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+    )
+
+    for group in groups:
+        matches = list(
+            Match.objects.filter(**{f: group[f] for f in key_fields}).order_by('id')
+        )
+        keeper = next((m for m in matches if m.api_id), matches[0])
+        duplicates = [m for m in matches if m.id != keeper.id]
+        api_id = keeper.api_id
+        merged = set()
+
+        for dup in duplicates:
+            for field in merge_fields:
+                value = getattr(dup, field)
+                if getattr(keeper, field) is None and value is not None:
+                    setattr(keeper, field, value)
+                    merged.add(field)
+            if dup.status == 'FINISHED' and keeper.status != 'FINISHED':
+                keeper.status = dup.status
+                merged.add('status')
+
+            Prediction.objects.filter(match_id=dup.id).update(match_id=keeper.id)
+            ShotEvent.objects.filter(match_id=dup.id).update(match_id=keeper.id)
+            MatchIncident.objects.filter(match_id=dup.id).update(match_id=keeper.id)
+
+            # unique_together (match, player): solo mover jugadores que el
+            # partido conservado no tenga ya
+            kept_players = MatchPlayerStats.objects.filter(match_id=keeper.id).values('player_id')
+            MatchPlayerStats.objects.filter(match_id=dup.id).exclude(
+                player_id__in=kept_players
+            ).update(match_id=keeper.id)
+
+            api_id = api_id or dup.api_id
+            dup.delete()
+
+        if api_id and not keeper.api_id:
+            keeper.api_id = api_id
+            merged.add('api_id')
+
+        if merged:
+            keeper.save(update_fields=sorted(merged))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0009_importjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_matches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0010_merge_duplicate_matches'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='match',
+            constraint=models.UniqueConstraint(fields=('competition', 'season', 'home_team', 'away_team', 'utc_date'), name='uniq_match_fixture'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0011_match_uniq_match_fixture'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='odds',
+            field=models.JSONField(blank=True, help_text='Cuotas de Football-Data.co.uk. Format: {b365_odds_home, ps_odds_over_25, avg_odds_ah_away, ...}', null=True),
+        ),
+    ]
@@ -4,7 +4,7 @@ Combina predicciones de Machine Learning con modelos estadísticos para mejor ac
 """
 
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from predictions.models import Match, PoissonParams
 from predictions.ml.predictor import EnhancedPredictor
 from predictions.ml.poisson import DixonColesModel, PoissonModel
@@ -69,51 +69,71 @@ class EnsemblePredictor:
             - 'ml_probs', 'poisson_probs': Predicciones individuales
             - 'confidence': Nivel de confianza (0-100)
         """
-        # 1. Predicción ML (requiere parámetros separados)
-        ml_prediction = self.ml_predictor.predict_match(
-            home_team_id=match.home_team_id,
-            away_team_id=match.away_team_id,
-            match_date=match.utc_date,
-            competition_id=match.competition_id,
-            season=match.season
-        )
+        return self.predict_matches_batch([match])[0]
 
-        # Adaptar formato ML (viene con estructura anidada)
-        ml_flat = {
-            'prob_home': ml_prediction['result']['home_win'],
-            'prob_draw': ml_prediction['result']['draw'],
-            'prob_away': ml_prediction['result']['away_win'],
-            'prob_over_25': ml_prediction['over_25']['yes'],
-            'prob_btts': ml_prediction['btts']['yes'],
-        }
+    def predict_matches_batch(self, matches: List[Match], skip_errors: bool = False) -> List:
+        """
+        Genera predicciones combinadas ML + Poisson para varios partidos a la vez
+
+        El ML evalúa cada modelo una sola vez sobre todos los partidos, los
+        parámetros Poisson se leen en una sola consulta y las matrices de
+        marcadores se calculan vectorizadas (N, 11, 11).
+
+        Args:
+            matches: Lista de Match de Django
+            skip_errors: Si True, un partido sin features ML queda como None
 
-        # 2. Predicción Poisson/Dixon-Coles
-        poisson_prediction = self._predict_poisson(match)
-
-        if poisson_prediction is None:
-            # Si no hay parámetros Poisson, usar solo ML
-            return {
-                **ml_flat,
-                'method': 'ml_only',
-                'confidence': 60,
-                'ml_probs': ml_flat,
-                'poisson_probs': None,
+        Returns:
+            Lista alineada con matches, con el mismo formato que predict_match
+        """
+        # 1. Predicción ML de todos los partidos
+        ml_predictions = self.ml_predictor.predict_matches_batch(matches, skip_errors)
+
+        # 2. Predicción Poisson/Dixon-Coles de los partidos con parámetros
+        poisson_predictions = self._predict_poisson_batch(matches)
+
+        results = []
+        for ml_prediction, poisson_prediction in zip(ml_predictions, poisson_predictions):
+            if ml_prediction is None:
+                results.append(None)
+                continue
+
+            # Adaptar formato ML (viene con estructura anidada)
+            ml_flat = {
+                'prob_home': ml_prediction['result']['home_win'],
+                'prob_draw': ml_prediction['result']['draw'],
+                'prob_away': ml_prediction['result']['away_win'],
+                'prob_over_25': ml_prediction['over_25']['yes'],
+                'prob_btts': ml_prediction['btts']['yes'],
             }
 
-        # 3. Combinar predicciones con pesos específicos por mercado
-        combined = self._combine_predictions(ml_flat, poisson_prediction)
+            if poisson_prediction is None:
+                # Si no hay parámetros Poisson, usar solo ML
+                results.append({
+                    **ml_flat,
+                    'method': 'ml_only',
+                    'confidence': 60,
+                    'ml_probs': ml_flat,
+                    'poisson_probs': None,
+                })
+                continue
+
+            # 3. Combinar predicciones con pesos específicos por mercado
+            combined = self._combine_predictions(ml_flat, poisson_prediction)
 
-        # 4. Calcular confianza basada en acuerdo entre modelos
-        confidence = self._calculate_confidence(ml_flat, poisson_prediction)
+            # 4. Calcular confianza basada en acuerdo entre modelos
+            confidence = self._calculate_confidence(ml_flat, poisson_prediction)
 
-        combined['method'] = 'ensemble'
-        combined['confidence'] = confidence
-        combined['ml_probs'] = ml_flat
-        combined['poisson_probs'] = poisson_prediction
-        combined['lambda_home'] = poisson_prediction.get('lambda_home')
-        combined['lambda_away'] = poisson_prediction.get('lambda_away')
+            combined['method'] = 'ensemble'
+            combined['confidence'] = confidence
+            combined['ml_probs'] = ml_flat
+            combined['poisson_probs'] = poisson_prediction
+            combined['lambda_home'] = poisson_prediction.get('lambda_home')
+            combined['lambda_away'] = poisson_prediction.get('lambda_away')
 
-        return combined
+            results.append(combined)
+
+        return results
 
     def _predict_poisson(self, match: Match) -> Optional[Dict]:
         """
@@ -125,21 +145,24 @@ class EnsemblePredictor:
         Returns:
             Dictionary con probabilidades o None si no hay parámetros
         """
-        try:
-            # Obtener parámetros de ataque/defensa de ambos equipos
-            home_params = PoissonParams.objects.get(
-                team=match.home_team,
-                competition=match.competition,
-                season=match.season
-            )
-            away_params = PoissonParams.objects.get(
-                team=match.away_team,
-                competition=match.competition,
-                season=match.season
+        return self._predict_poisson_batch([match])[0]
+
+    def _predict_poisson_batch(self, matches: List[Match]) -> List[Optional[Dict]]:
+        """
+        Predicciones Poisson/Dixon-Coles de varios partidos
+
+        Returns:
+            Lista alineada con matches; None donde no hay parámetros
+        """
+        # Obtener parámetros de ataque/defensa de todos los equipos (una consulta)
+        params = {
+            (p.team_id, p.competition_id, p.season): p
+            for p in PoissonParams.objects.filter(
+                team_id__in={m.home_team_id for m in matches} | {m.away_team_id for m in matches},
+                competition_id__in={m.competition_id for m in matches},
+                season__in={m.season for m in matches},
             )
-        except PoissonParams.DoesNotExist:
-            # No hay parámetros calculados para estos equipos
-            return None
+        }
 
         # Determinar home_advantage promedio de la liga
         # TODO: Esto podría venir de estimate_team_strengths guardado en BD
@@ -151,27 +174,45 @@ class EnsemblePredictor:
         else:
             model = PoissonModel(home_advantage=home_advantage)
 
-        # Calcular λ (goles esperados)
-        lambda_home, lambda_away = model.calculate_expected_goals(
-            home_attack=home_params.attack_strength,
-            home_defense=home_params.defense_strength,
-            away_attack=away_params.attack_strength,
-            away_defense=away_params.defense_strength
-        )
-
-        # Generar predicciones de mercados
-        predictions = model.predict_match_outcome(lambda_home, lambda_away, max_goals=10)
+        # Calcular λ (goles esperados) de los partidos con parámetros
+        indices, lambdas_home, lambdas_away = [], [], []
+        for idx, match in enumerate(matches):
+            home_params = params.get((match.home_team_id, match.competition_id, match.season))
+            away_params = params.get((match.away_team_id, match.competition_id, match.season))
+            if home_params is None or away_params is None:
+                # No hay parámetros calculados para estos equipos
+                continue
+
+            lambda_home, lambda_away = model.calculate_expected_goals(
+                home_attack=home_params.attack_strength,
+                home_defense=home_params.defense_strength,
+                away_attack=away_params.attack_strength,
+                away_defense=away_params.defense_strength
+            )
+            indices.append(idx)
+            lambdas_home.append(lambda_home)
+            lambdas_away.append(lambda_away)
+
+        results = [None] * len(matches)
+        if not indices:
+            return results
+
+        # Generar predicciones de mercados (vectorizado)
+        predictions = model.predict_match_outcomes(lambdas_home, lambdas_away, max_goals=10)
+
+        for n, idx in enumerate(indices):
+            results[idx] = {
+                'prob_home': float(predictions['home_win'][n]),
+                'prob_draw': float(predictions['draw'][n]),
+                'prob_away': float(predictions['away_win'][n]),
+                'prob_over_25': float(predictions['over_25'][n]),
+                'prob_btts': float(predictions['btts'][n]),
+                'lambda_home': lambdas_home[n],
+                'lambda_away': lambdas_away[n],
+                'expected_total_goals': float(predictions['expected_total_goals'][n]),
+            }
 
-        return {
-            'prob_home': predictions['home_win'],
-            'prob_draw': predictions['draw'],
-            'prob_away': predictions['away_win'],
-            'prob_over_25': predictions['over_25'],
-            'prob_btts': predictions['btts'],
-            'lambda_home': lambda_home,
-            'lambda_away': lambda_away,
-            'expected_total_goals': predictions['expected_total_goals'],
-        }
+        return results
 
     def _combine_predictions(self, ml_pred: Dict, poisson_pred: Dict) -> Dict:
         """
@@ -330,12 +371,13 @@ class ValueBetDetector:
         self.ensemble = ensemble
         self.min_edge = min_edge
 
-    def find_value_bets(self, match: Match) -> list:
+    def find_value_bets(self, match: Match, prediction: Optional[Dict] = None) -> list:
         """
         Encuentra apuestas de valor para un partido
 
         Args:
             match: Match object con odds disponibles
+            prediction: Predicción ensemble ya calculada (se genera si es None)
 
         Returns:
             Lista de value bets detectadas:
@@ -353,7 +395,8 @@ class ValueBetDetector:
         value_bets = []
 
         # Generar predicción ensemble
-        prediction = self.ensemble.predict_match(match)
+        if prediction is None:
+            prediction = self.ensemble.predict_match(match)
 
         # Verificar odds disponibles
         if not match.odds_b365_home:
@@ -113,41 +113,75 @@ class PoissonModel:
             - 'btts': Probabilidad de ambos equipos anoten
             - 'expected_total_goals': Total de goles esperados
         """
+        outcomes = self.predict_match_outcomes([lambda_home], [lambda_away], max_goals)
+
+        result = {market: float(probs[0]) for market, probs in outcomes.items()}
+        result['lambda_home'] = lambda_home
+        result['lambda_away'] = lambda_away
+        return result
+
+    def score_matrices(self, lambda_home, lambda_away, max_goals: int = 10) -> np.ndarray:
+        """
+        Matrices de probabilidad de marcadores para N partidos a la vez
+
+        Args:
+            lambda_home: Array (N,) de goles esperados del local
+            lambda_away: Array (N,) de goles esperados del visitante
+            max_goals: Máximo de goles a considerar
+
+        Returns:
+            Array (N, max_goals + 1, max_goals + 1) con [n, i, j] = P(local i, visitante j)
+        """
+        goals = np.arange(max_goals + 1)
+        # Una sola llamada a pmf por equipo con broadcasting (N, 1) x (G,)
+        home_pmf = poisson.pmf(goals, np.asarray(lambda_home, dtype=float)[:, None])
+        away_pmf = poisson.pmf(goals, np.asarray(lambda_away, dtype=float)[:, None])
+
+        # Asume independencia entre equipos
+        return home_pmf[:, :, None] * away_pmf[:, None, :]
+
+    def predict_match_outcomes(self, lambda_home, lambda_away,
+                               max_goals: int = 10) -> Dict[str, np.ndarray]:
+        """
+        Versión vectorizada de predict_match_outcome para N partidos
+
+        Args:
+            lambda_home: Array (N,) de goles esperados del local
+            lambda_away: Array (N,) de goles esperados del visitante
+            max_goals: Máximo de goles a considerar (default: 10)
+
+        Returns:
+            Dictionary con arrays (N,) para los mismos mercados que predict_match_outcome
+        """
         # Calcular matriz de probabilidades para todos los marcadores
-        prob_matrix = np.zeros((max_goals + 1, max_goals + 1))
+        prob_matrix = self.score_matrices(lambda_home, lambda_away, max_goals)
 
-        for home_g in range(max_goals + 1):
-            for away_g in range(max_goals + 1):
-                prob_matrix[home_g, away_g] = self.predict_score_probability(
-                    lambda_home, lambda_away, home_g, away_g
-                )
+        home_goals = np.arange(max_goals + 1)[:, None]
+        away_goals = np.arange(max_goals + 1)[None, :]
 
         # Probabilidades de resultado
-        home_win = np.sum(np.tril(prob_matrix, -1))  # Local gana (diagonal inferior)
-        draw = np.sum(np.diag(prob_matrix))          # Empate (diagonal)
-        away_win = np.sum(np.triu(prob_matrix, 1))   # Visitante gana (diagonal superior)
+        home_win = prob_matrix[:, home_goals > away_goals].sum(axis=1)  # Diagonal inferior
+        draw = np.trace(prob_matrix, axis1=1, axis2=2)                  # Diagonal
+        away_win = prob_matrix[:, home_goals < away_goals].sum(axis=1)  # Diagonal superior
 
         # Probabilidades de Over/Under
-        over_05 = 1 - prob_matrix[0, 0]  # Al menos 1 gol total
+        over_05 = 1 - prob_matrix[:, 0, 0]  # Al menos 1 gol total
 
-        under_15 = prob_matrix[0, 0] + prob_matrix[1, 0] + prob_matrix[0, 1]
+        under_15 = prob_matrix[:, 0, 0] + prob_matrix[:, 1, 0] + prob_matrix[:, 0, 1]
         over_15 = 1 - under_15
 
-        under_25 = np.sum(prob_matrix[0:2, 0:2])  # 0-0, 0-1, 1-0, 1-1
+        under_25 = prob_matrix[:, 0:2, 0:2].sum(axis=(1, 2))  # 0-0, 0-1, 1-0, 1-1
         over_25 = 1 - under_25
 
-        under_35 = 0
-        for i in range(max_goals + 1):
-            for j in range(max_goals + 1):
-                if i + j <= 3:
-                    under_35 += prob_matrix[i, j]
+        under_35 = prob_matrix[:, home_goals + away_goals <= 3].sum(axis=1)
         over_35 = 1 - under_35
 
         # BTTS (Both Teams To Score)
-        btts = 1 - prob_matrix[0, :].sum() - prob_matrix[:, 0].sum() + prob_matrix[0, 0]
+        btts = (1 - prob_matrix[:, 0, :].sum(axis=1) - prob_matrix[:, :, 0].sum(axis=1)
+                + prob_matrix[:, 0, 0])
 
         # Goles esperados totales
-        expected_total = lambda_home + lambda_away
+        expected_total = np.asarray(lambda_home, dtype=float) + np.asarray(lambda_away, dtype=float)
 
         return {
             'home_win': home_win,
@@ -159,8 +193,6 @@ class PoissonModel:
             'over_35': over_35,
             'btts': btts,
             'expected_total_goals': expected_total,
-            'lambda_home': lambda_home,
-            'lambda_away': lambda_away,
         }
 
 
@@ -264,6 +296,24 @@ class DixonColesModel(PoissonModel):
         # Probabilidad ajustada
         return tau * prob_poisson
 
+    def score_matrices(self, lambda_home, lambda_away, max_goals: int = 10) -> np.ndarray:
+        """
+        Matrices de marcadores de N partidos con el ajuste τ de Dixon-Coles
+
+        Mismo resultado que tau_correction aplicado marcador a marcador.
+        """
+        prob_matrix = super().score_matrices(lambda_home, lambda_away, max_goals)
+        lambda_home = np.asarray(lambda_home, dtype=float)
+        lambda_away = np.asarray(lambda_away, dtype=float)
+
+        # Solo los marcadores bajos llevan ajuste (τ = 1 para el resto)
+        prob_matrix[:, 0, 0] *= 1 - lambda_home * lambda_away * self.rho
+        prob_matrix[:, 1, 0] *= 1 + lambda_away * self.rho
+        prob_matrix[:, 0, 1] *= 1 + lambda_home * self.rho
+        prob_matrix[:, 1, 1] *= 1 - self.rho
+
+        return prob_matrix
+
 
 def estimate_team_strengths(matches: List[Dict], use_dixon_coles: bool = True) -> Dict:
     """
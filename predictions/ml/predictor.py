@@ -551,81 +551,94 @@ class EnhancedPredictor:
             status='SCHEDULED'
         )
 
+        return self.predict_matches_batch([temp_match])[0]
+
+    def predict_matches_batch(self, matches: List[Match], skip_errors: bool = False) -> List:
+        """
+        Hacer predicciones para varios partidos a la vez
+
+        Los features se calculan por partido, pero cada modelo se evalúa una
+        sola vez sobre la matriz con todos ellos (un predict_proba por mercado).
+
+        Args:
+            matches: Partidos (solo se usan equipos, fecha, competición y temporada)
+            skip_errors: Si True, un partido cuyos features fallan queda como
+                         None en vez de abortar todo el lote
+
+        Returns:
+            Lista alineada con matches, con el mismo formato que predict_match
+        """
         # Calcular features mejorados
-        features = self.fe.calculate_enhanced_features(temp_match)
+        rows = []
+        ok = []
+        for idx, match in enumerate(matches):
+            temp_match = Match(
+                home_team_id=match.home_team_id,
+                away_team_id=match.away_team_id,
+                utc_date=match.utc_date,
+                competition_id=match.competition_id,
+                season=match.season,
+                status='SCHEDULED'
+            )
+            try:
+                features = self.fe.calculate_enhanced_features(temp_match)
+            except Exception as e:
+                if not skip_errors:
+                    raise
+                print(f"[WARNING] Features no disponibles para el partido {match.pk}: {e}")
+                continue
+            rows.append([features.get(col, 0) for col in self.ENHANCED_FEATURE_COLUMNS])
+            ok.append(idx)
+
+        results = [None] * len(matches)
+        if not rows:
+            return results
 
         # Preparar input
-        X = np.array([[features.get(col, 0) for col in self.ENHANCED_FEATURE_COLUMNS]])
+        X = np.array(rows)
 
-        predictions = {}
+        predictions = [{} for _ in rows]
 
         # RESULTADO
         if self.models['result']:
-            probs = self.models['result'].predict_proba(X)[0]
-            predictions['result'] = {
-                'home_win': float(probs[0]),
-                'draw': float(probs[1]),
-                'away_win': float(probs[2]),
-                'most_likely': ['H', 'D', 'A'][np.argmax(probs)]
-            }
-
-        # OVER 2.5
-        if self.models['over_25']:
-            prob = self.models['over_25'].predict_proba(X)[0]
-            predictions['over_25'] = {
-                'no': float(prob[0]),
-                'yes': float(prob[1])
-            }
-
-        # BTTS
-        if self.models['btts']:
-            prob = self.models['btts'].predict_proba(X)[0]
-            predictions['btts'] = {
-                'no': float(prob[0]),
-                'yes': float(prob[1])
-            }
-
-        # CORNERS - Total predicho
-        if self.models['total_corners']:
-            predicted_total = self.models['total_corners'].predict(X)[0]
-            predictions['total_corners'] = {
-                'predicted': float(predicted_total),
-                'avg': float(self.stats.get('avg_total_corners', 10.5))
-            }
-
-        # CORNERS - Over 9.5
-        if self.models['over_95_corners']:
-            prob = self.models['over_95_corners'].predict_proba(X)[0]
-            predictions['over_95_corners'] = {
-                'no': float(prob[0]),
-                'yes': float(prob[1])
-            }
-
-        # CORNERS - Over 10.5
-        if self.models['over_105_corners']:
-            prob = self.models['over_105_corners'].predict_proba(X)[0]
-            predictions['over_105_corners'] = {
-                'no': float(prob[0]),
-                'yes': float(prob[1])
-            }
-
-        # TIROS - Total predicho
-        if self.models['total_shots']:
-            predicted_total = self.models['total_shots'].predict(X)[0]
-            predictions['total_shots'] = {
-                'predicted': float(predicted_total),
-                'avg': float(self.stats.get('avg_total_shots', 24.0))
-            }
-
-        # TIROS A PUERTA - Total predicho
-        if self.models['total_shots_on_target']:
-            predicted_total = self.models['total_shots_on_target'].predict(X)[0]
-            predictions['total_shots_on_target'] = {
-                'predicted': float(predicted_total),
-                'avg': float(self.stats.get('avg_total_shots_on_target', 9.0))
-            }
-
-        return predictions
+            probs = self.models['result'].predict_proba(X)
+            most_likely = np.argmax(probs, axis=1)
+            for prediction, row, best in zip(predictions, probs, most_likely):
+                prediction['result'] = {
+                    'home_win': float(row[0]),
+                    'draw': float(row[1]),
+                    'away_win': float(row[2]),
+                    'most_likely': ['H', 'D', 'A'][best]
+                }
+
+        # OVER 2.5, BTTS y CORNERS Over 9.5 / 10.5 (clasificadores binarios)
+        for market in ('over_25', 'btts', 'over_95_corners', 'over_105_corners'):
+            if self.models[market]:
+                probs = self.models[market].predict_proba(X)
+                for prediction, row in zip(predictions, probs):
+                    prediction[market] = {
+                        'no': float(row[0]),
+                        'yes': float(row[1])
+                    }
+
+        # CORNERS y TIROS - Totales predichos (regresión)
+        for market, stat, default_avg in (
+            ('total_corners', 'avg_total_corners', 10.5),
+            ('total_shots', 'avg_total_shots', 24.0),
+            ('total_shots_on_target', 'avg_total_shots_on_target', 9.0),
+        ):
+            if self.models[market]:
+                predicted_totals = self.models[market].predict(X)
+                avg = float(self.stats.get(stat, default_avg))
+                for prediction, predicted_total in zip(predictions, predicted_totals):
+                    prediction[market] = {
+                        'predicted': float(predicted_total),
+                        'avg': avg
+                    }
+
+        for idx, prediction in zip(ok, predictions):
+            results[idx] = prediction
+        return results
 
     def save_models(self, path: str = 'enhanced_models.pkl'):
         """Guardar modelos"""
@@ -154,6 +154,11 @@ class Match(models.Model):
         blank=True,
         help_text='Mejores jugadores del partido (MVP de cada equipo)'
     )
+    odds = models.JSONField(
+        null=True,
+        blank=True,
+        help_text='Cuotas de Football-Data.co.uk. Format: {b365_odds_home, ps_odds_over_25, avg_odds_ah_away, ...}'
+    )
 
     class Meta:
         db_table = 'matches'
@@ -163,6 +168,13 @@ class Match(models.Model):
             models.Index(fields=['competition', 'season', 'home_team', 'away_team']),
             models.Index(fields=['status', 'utc_date']),
         ]
+        constraints = [
+            # Un partido por fixture: permite upserts con ON CONFLICT al importar CSVs
+            models.UniqueConstraint(
+                fields=['competition', 'season', 'home_team', 'away_team', 'utc_date'],
+                name='uniq_match_fixture',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.home_team.name} vs {self.away_team.name} ({self.utc_date.date()})"
@@ -20,9 +20,12 @@ Usage:
 
     # Get individual player values
     players = scraper.get_team_squad_values(team_id)
+
+    # Release the pooled connection when done (or use it as a context manager)
+    scraper.close()
 """
 
-import requests
+import httpx
 import re
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
@@ -52,6 +55,10 @@ TRANSFERMARKT_LEAGUE_NAMES = {
     'CL': 'champions-league',
 }
 
+# Requests go out one at a time (rate limiter): a single kept-alive HTTP/2
+# connection is reused for all of them instead of a new TLS handshake each
+TRANSFERMARKT_CLIENT_LIMITS = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+
 
 class TransfermarktScraper:
     """
@@ -82,6 +89,25 @@ class TransfermarktScraper:
         else:
             self.base_url = self.BASE_URL
 
+        # Pooled client shared by all requests of this scraper
+        self.client = httpx.Client(
+            http2=True,
+            headers=self.headers,
+            timeout=30,
+            limits=TRANSFERMARKT_CLIENT_LIMITS,
+            follow_redirects=True,  # /x/ URLs redirect to the team slug
+        )
+
+    def close(self):
+        """Close the pooled HTTP connection"""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def _make_request(self, url: str, max_retries: int = 3) -> Optional[BeautifulSoup]:
         """
         Make HTTP request with rate limiting and retry logic
@@ -97,7 +123,7 @@ class TransfermarktScraper:
             try:
                 self.rate_limiter.wait()
 
-                response = requests.get(url, headers=self.headers, timeout=30)
+                response = self.client.get(url)
 
                 if response.status_code == 429:
                     print("[WARNING] Rate limited by Transfermarkt")
@@ -117,7 +143,7 @@ class TransfermarktScraper:
 
                 return BeautifulSoup(response.content, 'html.parser')
 
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPError as e:
                 print(f"Request error (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
                     import time
@@ -5,7 +5,7 @@ Usado por todos los scrapers e import commands
 
 import time
 import random
-from thefuzz import process, fuzz
+from rapidfuzz import process, fuzz, utils as fuzz_utils
 from predictions.models import Team, Player
 
 
@@ -111,8 +111,8 @@ def fuzzy_match_team(scraped_name: str, existing_teams, threshold: int = 80):
             if team.name == override_name:
                 return team, 100
 
-    # Build mapping of team names to IDs
-    team_names = {team.id: team.name for team in existing_teams}
+    # Build mapping of teams to names (extractOne returns the matched key)
+    team_names = {team: team.name for team in existing_teams}
 
     if not team_names:
         return None, 0
@@ -120,20 +120,15 @@ def fuzzy_match_team(scraped_name: str, existing_teams, threshold: int = 80):
     # Fuzzy match
     result = process.extractOne(
         scraped_name,
-        team_names.values(),
+        team_names,
         scorer=fuzz.token_sort_ratio,
+        processor=fuzz_utils.default_process,
         score_cutoff=threshold
     )
 
     if result:
-        matched_name, score = result[0], result[1]
-        # Find team ID for matched name
-        team_id = [k for k, v in team_names.items() if v == matched_name][0]
-
-        # Get Team object
-        for team in existing_teams:
-            if team.id == team_id:
-                return team, score
+        _, score, team = result
+        return team, round(score)
 
     return None, 0
 
@@ -162,8 +157,8 @@ def fuzzy_match_player(scraped_name: str, existing_players, threshold: int = 85)
             if player.name == override_name:
                 return player, 100
 
-    # Build mapping
-    player_names = {player.id: player.name for player in existing_players}
+    # Build mapping (extractOne returns the matched key)
+    player_names = {player: player.name for player in existing_players}
 
     if not player_names:
         return None, 0
@@ -176,18 +171,64 @@ def fuzzy_match_player(scraped_name: str, existing_players, threshold: int = 85)
     # Fuzzy match
     result = process.extractOne(
         scraped_name,
-        player_names.values(),
+        player_names,
         scorer=fuzz.token_sort_ratio,
+        processor=fuzz_utils.default_process,
         score_cutoff=threshold
     )
 
     if result:
-        matched_name, score = result[0], result[1]
-        player_id = [k for k, v in player_names.items() if v == matched_name][0]
+        _, score, player = result
+        return player, round(score)
 
-        for player in existing_players:
-            if player.id == player_id:
-                return player, score
+    return None, 0
+
+
+def prepare_fuzzy_choices(candidates, attr: str = 'name') -> dict:
+    """
+    Preprocess candidate names once, for repeated fuzzy_match_prepared calls
+
+    Args:
+        candidates: QuerySet or list of Team/Player objects
+        attr: Name attribute to match against
+
+    Returns:
+        dict: {object: preprocessed name}
+
+    Example:
+        >>> choices = prepare_fuzzy_choices(list(Player.objects.filter(team=team)))
+        >>> player, score = fuzzy_match_prepared('B. Saka', choices, threshold=85)
+    """
+    return {
+        candidate: fuzz_utils.default_process(getattr(candidate, attr))
+        for candidate in candidates
+    }
+
+
+def fuzzy_match_prepared(scraped_name: str, choices: dict, threshold: int = 85):
+    """
+    Fuzzy match against choices from prepare_fuzzy_choices
+
+    Same scoring as fuzzy_match_team/fuzzy_match_player (no overrides), but
+    only the scraped name is preprocessed on each call.
+
+    Returns:
+        tuple: (object, score) or (None, 0) if no match
+    """
+    if not choices:
+        return None, 0
+
+    result = process.extractOne(
+        fuzz_utils.default_process(scraped_name),
+        choices,
+        scorer=fuzz.token_sort_ratio,
+        processor=None,
+        score_cutoff=threshold
+    )
+
+    if result:
+        _, score, candidate = result
+        return candidate, round(score)
 
     return None, 0
 
@@ -245,6 +286,52 @@ def normalize_player_name(name: str) -> str:
     return name
 
 
+def team_index_key(name: str) -> str:
+    """Key of a team name in a team index (see build_team_index)"""
+    return normalize_team_name(name).casefold()
+
+
+def build_team_index(existing_teams) -> dict:
+    """
+    Index teams by normalized name, for exact lookups before fuzzy matching
+
+    Names are normalized with normalize_team_name, so the overrides and
+    common suffixes resolve to the same key on both sides.
+
+    Example:
+        >>> teams = list(Team.objects.filter(competition__code='PL'))
+        >>> index = build_team_index(teams)
+        >>> team = index.get(team_index_key('Manchester United FC'))
+    """
+    index = {}
+    for team in existing_teams:
+        index.setdefault(team_index_key(team.name), team)
+    return index
+
+
+def player_index_key(name: str) -> str:
+    """Key of a player name in a player index (see build_player_index)"""
+    return normalize_player_name(name).casefold()
+
+
+def build_player_index(existing_players) -> dict:
+    """
+    Index players by name and short_name, for exact lookups before fuzzy matching
+
+    Example:
+        >>> players = list(Player.objects.filter(team__name='Arsenal'))
+        >>> index = build_player_index(players)
+        >>> player = index.get(player_index_key('Bruno Fernandes'))
+    """
+    index = {}
+    for player in existing_players:
+        index.setdefault(player.name.strip().casefold(), player)
+    for player in existing_players:
+        if player.short_name:
+            index.setdefault(player.short_name.strip().casefold(), player)
+    return index
+
+
 # ============================================================================
 # RATE LIMITING DECORATORS AND UTILITIES
 # ============================================================================
@@ -395,6 +482,15 @@ def parse_transfermarkt_value(value_str: str) -> int:
 
 def safe_float(value, default=0.0):
     """Safely convert value to float, return default on error"""
+    # Fast path: JSON payloads already carry native numbers
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    if value is None:
+        return default
+
     try:
         if value is None or value == '' or value == '-':
             return default
@@ -405,6 +501,13 @@ def safe_float(value, default=0.0):
 
 def safe_int(value, default=0):
     """Safely convert value to int, return default on error"""
+    # Fast path: JSON payloads already carry native numbers
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value is None:
+        return default
+
     try:
         if value is None or value == '' or value == '-':
             return default
@@ -1,60 +1,142 @@
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, Error as PlaywrightError
 import asyncio
 from datetime import datetime, timedelta
+from pathlib import Path
 import pandas as pd
 import time
 import random
+import orjson
 
 BASE_URL = "https://www.sofascore.com/api/v1"
 
+# Respuestas que se reintentan con backoff exponencial (rate limit / caídas)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 60  # segundos
+
+
+class SofascoreAPIError(Exception):
+    """Respuesta no válida de SofaScore (estado HTTP o cuerpo no JSON)"""
+
+
+# Errores de red/HTTP de una petición: el llamador puede avisar y seguir
+FETCH_ERRORS = (SofascoreAPIError, PlaywrightError, asyncio.TimeoutError)
+
 
 class SofascoreAPI:
-    def __init__(self, delay_min=2, delay_max=5):
+    def __init__(self, delay_min=2, delay_max=5, concurrency=1, rate=None, max_retries=5,
+                 cache_dir=None, refresh_cache=False):
         self.browser = None
         self.page = None
         self.playwright = None
         self.delay_min = delay_min  # Delay mínimo entre peticiones (segundos)
         self.delay_max = delay_max  # Delay máximo entre peticiones (segundos)
-        self.last_request_time = 0
+        # Peticiones por segundo; si es None se usa el delay aleatorio
+        self.rate = rate
+        self.max_retries = max_retries
+        self.next_request_time = 0
+        self._rate_lock = asyncio.Lock()
+        # Una página por petición simultánea: dos goto() sobre la misma
+        # página se cancelan entre sí
+        self.concurrency = max(1, concurrency)
+        self.pages = None
+        self._init_lock = asyncio.Lock()
+        # Cache en disco de equipos/partidos de temporadas cerradas (None = sin cache);
+        # refresh_cache vuelve a descargarlos y reescribe la cache
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.refresh_cache = refresh_cache
 
     async def _init_browser(self):
-        if self.playwright is None:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=True)
-            self.page = await self.browser.new_page()
+        async with self._init_lock:
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+                self.page = await self.browser.new_page()
+                self.pages = asyncio.Queue()
+                self.pages.put_nowait(self.page)
+                for _ in range(self.concurrency - 1):
+                    self.pages.put_nowait(await self.browser.new_page())
 
     async def _wait_if_needed(self):
-        """Rate limiting: espera entre peticiones"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """
+        Rate limiting: espera entre peticiones
 
-        if time_since_last < self.delay_min:
-            # Añadir delay aleatorio para parecer más humano
-            delay = random.uniform(self.delay_min, self.delay_max)
-            await asyncio.sleep(delay)
+        Cada petición reserva el siguiente hueco libre, así las peticiones
+        simultáneas (pool de páginas) quedan espaciadas en vez de salir juntas.
+        """
+        async with self._rate_lock:
+            now = time.monotonic()
+            if self.rate:
+                interval = 1 / self.rate
+            else:
+                # Añadir delay aleatorio para parecer más humano
+                interval = random.uniform(self.delay_min, self.delay_max)
+            start = max(now, self.next_request_time)
+            self.next_request_time = start + interval
 
-        self.last_request_time = time.time()
+        if start > now:
+            await asyncio.sleep(start - now)
 
-    async def _get(self, endpoint):
+    def _backoff(self, attempt, retry_after=None):
+        """Segundos a esperar antes del reintento: Retry-After o 2^intento con jitter"""
+        try:
+            wait_time = float(retry_after)
+        except (TypeError, ValueError):
+            wait_time = 2 ** attempt + random.random()
+        return min(wait_time, MAX_BACKOFF)
+
+    async def _goto(self, url):
+        """Abrir la URL en una página libre del pool y devolver la respuesta JSON"""
         await self._init_browser()
-        await self._wait_if_needed()  # Rate limiting
 
-        url = f"{BASE_URL}{endpoint}"
-        response = await self.page.goto(url)
-        if response.status == 200:
-            return await response.json()
-        else:
-            raise Exception(f"Failed to fetch {endpoint}: {response.status}")
+        for attempt in range(self.max_retries + 1):
+            await self._wait_if_needed()  # Rate limiting
 
-    async def _raw_get(self, url):
-        await self._init_browser()
-        await self._wait_if_needed()  # Rate limiting
+            page = await self.pages.get()
+            try:
+                response = await page.goto(url)
+                if response.status == 200:
+                    try:
+                        # orjson: parseo más rápido de las respuestas grandes (temporadas)
+                        return orjson.loads(await response.body())
+                    except ValueError as e:
+                        raise SofascoreAPIError(f"Invalid JSON from {url}") from e
+                status = response.status
+                retry_after = response.headers.get('retry-after')
+            finally:
+                self.pages.put_nowait(page)
+
+            if status not in RETRY_STATUSES or attempt == self.max_retries:
+                break
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        raise SofascoreAPIError(f"Failed to fetch {url}: {status}")
+
+    def _cache_path(self, tournament_id, season_id, name):
+        return self.cache_dir / f"{tournament_id}_{season_id}_{name}.json"
 
-        response = await self.page.goto(url)
-        if response.status == 200:
-            return await response.json()
-        else:
-            raise Exception(f"Failed to fetch {url}: {response.status}")
+    def _read_cache(self, tournament_id, season_id, name):
+        """Respuesta guardada de una temporada, o None si no hay (o se refresca)"""
+        if self.cache_dir is None or self.refresh_cache:
+            return None
+        try:
+            return orjson.loads(self._cache_path(tournament_id, season_id, name).read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, tournament_id, season_id, name, data):
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_path(tournament_id, season_id, name)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(orjson.dumps(data))
+        tmp_path.replace(path)
+
+    async def _get(self, endpoint):
+        return await self._goto(f"{BASE_URL}{endpoint}")
+
+    async def _raw_get(self, url):
+        return await self._goto(url)
 
     async def close(self):
         if self.browser:
@@ -385,25 +467,34 @@ class SofascoreAPI:
     # MÉTODOS PARA IMPORTACIÓN UNIFICADA
     # ============================================
 
-    async def get_season_teams(self, tournament_id, season_id):
+    async def get_season_teams(self, tournament_id, season_id, cached=False):
         """
         Obtener todos los equipos de una temporada con información completa
 
         Args:
             tournament_id: ID del torneo
             season_id: ID de la temporada
+            cached: usar la cache en disco (solo temporadas cerradas)
 
         Returns:
             dict: Información de equipos
         """
+        if cached:
+            teams_data = self._read_cache(tournament_id, season_id, 'teams')
+            if teams_data is not None:
+                return teams_data
+
         # Obtener lista de equipos
         teams_endpoint = f"/unique-tournament/{tournament_id}/season/{season_id}/teams"
         teams_data = await self._get(teams_endpoint)
 
+        if cached and teams_data:
+            self._write_cache(tournament_id, season_id, 'teams', teams_data)
+
         # teams_data ya contiene la lista de equipos bajo la key 'teams'
         return teams_data
 
-    async def get_season_matches(self, tournament_id, season_id, status='all'):
+    async def get_season_matches(self, tournament_id, season_id, status='all', cached=False):
         """
         Obtener todos los partidos de una temporada usando jornadas/rounds
 
@@ -411,10 +502,17 @@ class SofascoreAPI:
             tournament_id: ID del torneo
             season_id: ID de la temporada
             status: 'finished', 'scheduled', o 'all'
+            cached: usar la cache en disco (solo temporadas cerradas)
 
         Returns:
             list: Lista de partidos
         """
+        cache_name = f"matches_{status}"
+        if cached:
+            cached_matches = self._read_cache(tournament_id, season_id, cache_name)
+            if cached_matches is not None:
+                return cached_matches
+
         all_matches = []
         seen_match_ids = set()
 
@@ -425,6 +523,7 @@ class SofascoreAPI:
             if rounds_data and 'rounds' in rounds_data:
                 rounds = rounds_data['rounds']
                 print(f"  [INFO] Obteniendo partidos de {len(rounds)} jornadas...")
+                complete = True
 
                 for round_info in rounds:
                     round_num = round_info.get('round', 0)
@@ -451,9 +550,18 @@ class SofascoreAPI:
                                     seen_match_ids.add(match_id)
                     except Exception as e:
                         print(f"  [WARN] Error en jornada {round_num}: {e}")
+                        complete = False
                         continue
 
                 print(f"  [INFO] Total partidos obtenidos: {len(all_matches)}")
+
+                # Solo se guarda la lista completa (todas las jornadas, no el
+                # fallback) y sin partidos pendientes o en juego
+                if cached and complete and all_matches and not any(
+                    match.get('status', {}).get('type') in ('notstarted', 'inprogress')
+                    for match in all_matches
+                ):
+                    self._write_cache(tournament_id, season_id, cache_name, all_matches)
                 return all_matches
 
         except Exception as e: